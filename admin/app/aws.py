@@ -1,19 +1,23 @@
 """AWS service setup operations for admin service."""
 import boto3
+from functools import lru_cache
 from typing import Dict, Any, List
-from .config import settings
+from .config import settings, boto_config
+
+@lru_cache(maxsize=None)
+def _get_client(service_name: str) -> Any:
+    """Get a cached boto3 client for the given AWS service."""
+    return boto3.client(
+        service_name,
+        region_name=settings.AWS_REGION,
+        config=boto_config
+    )
 
 def setup_app_services(app: Any) -> Dict[str, Any]:
     """Set up AWS services (SES, SNS) for an application."""
     try:
-        ses = boto3.client(
-            "ses",
-            region_name=settings.AWS_REGION
-        )
-        sns = boto3.client(
-            "sns",
-            region_name=settings.AWS_REGION
-        )
+        ses = _get_client("ses")
+        sns = _get_client("sns")
     except Exception as e:
         raise RuntimeError(f"Failed to create AWS clients: {str(e)}")
 
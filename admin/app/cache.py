@@ -0,0 +1,125 @@
+"""In-process TTL caching helpers for admin service."""
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class TTLCache:
+    """Thread-safe key/value store whose entries expire after a fixed number of seconds."""
+    def __init__(self, ttl: float, maxsize: int = 128) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for key, treating expired entries as missing."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value for key, evicting expired then oldest entries when full."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                for stale_key in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+                    del self._entries[stale_key]
+            while len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (value, now + self.ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """Build a cache key from call arguments."""
+    return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+def ttl_cache(ttl: float, maxsize: int = 128) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Memoize a function's results for ttl seconds.
+
+    Concurrent misses for the same arguments are coalesced: the first caller
+    runs the function and the others wait for its result. The wrapped function
+    gains cache_invalidate(*args, **kwargs) and cache_clear() so writers can
+    drop stale entries; a call already in flight when they run is not cached,
+    and later callers start a fresh call instead of joining it.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        cache = TTLCache(ttl, maxsize)
+        # The future registered for a key also marks its generation: invalidating
+        # the key drops it, so a read started before the write cannot be cached
+        inflight: Dict[Hashable, Future] = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(args, kwargs)
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            with lock:
+                future = inflight.get(key)
+                if future is not None:
+                    owner = False
+                else:
+                    found, value = cache.get(key)
+                    if found:
+                        return value
+                    future = inflight[key] = Future()
+                    owner = True
+            if not owner:
+                return future.result()
+
+            try:
+                value = func(*args, **kwargs)
+            except BaseException as e:
+                with lock:
+                    if inflight.get(key) is future:
+                        del inflight[key]
+                future.set_exception(e)
+                raise
+            # Cache and retire the in-flight entry together, so a caller arriving
+            # in between finds one or the other instead of starting another read
+            with lock:
+                if inflight.get(key) is future:
+                    cache.set(key, value)
+                    del inflight[key]
+            future.set_result(value)
+            return value
+
+        def cache_invalidate(*args: Any, **kwargs: Any) -> None:
+            key = _make_key(args, kwargs)
+            with lock:
+                inflight.pop(key, None)
+                cache.invalidate(key)
+
+        def cache_clear() -> None:
+            with lock:
+                inflight.clear()
+                cache.clear()
+
+        wrapper.cache_invalidate = cache_invalidate  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        return wrapper
+    return decorator
@@ -1,6 +1,7 @@
 """Configuration settings for admin service."""
 import os
-from typing import Optional
+from typing import List, Optional
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,6 +14,16 @@ class Settings:
     AWS_ACCOUNT_ID: Optional[str] = os.getenv("AWS_ACCOUNT_ID")
     APP_CONFIG_TABLE: str = os.getenv("APPLICATIONS_TABLE", "Applications")
     API_KEYS_TABLE: str = os.getenv("API_KEYS_TABLE", "YANTECH-YNP01-AWS-DYNAMODB-API-KEYS-DEV")
+    # Server-side secret mixed into stored key hashes; leave unset to keep plain SHA-256
+    API_KEY_PEPPER: Optional[str] = os.getenv("API_KEY_PEPPER")
+    # Comma-separated CORS origins; "*" allows all (development)
+    ALLOWED_ORIGINS: List[str] = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",") if origin.strip()]
 
 settings = Settings()
 
+# Shared botocore config so every client reuses one pooled HTTPS connection set
+boto_config = Config(
+    max_pool_connections=64,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True
+)
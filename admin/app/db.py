@@ -1,48 +1,225 @@
 """Database operations for admin service."""
 import boto3
 import hashlib
-from typing import Dict, List, Any, Optional
-from .config import settings
+import hmac
+import time
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Any, Optional, Tuple
+from .cache import ttl_cache
+from .config import settings, boto_config
 
+# Attributes rendered by the application list endpoints
+_APP_LIST_ATTRIBUTES = (
+    "Application", "id", "App_name", "name", "application_id",
+    "Email", "email", "Domain", "domain", "created_at", "updated_at"
+)
+_APP_LIST_PROJECTION = ", ".join(f"#a{i}" for i in range(len(_APP_LIST_ATTRIBUTES)))
+_APP_LIST_NAMES = {f"#a{i}": attr for i, attr in enumerate(_APP_LIST_ATTRIBUTES)}
+
+# Attributes rendered by the API key list endpoint (never the key itself)
+_API_KEY_LIST_ATTRIBUTES = ("id", "name", "created_at", "expires_at", "last_used_at", "is_active")
+_API_KEY_LIST_PROJECTION = ", ".join(f"#k{i}" for i in range(len(_API_KEY_LIST_ATTRIBUTES)))
+_API_KEY_LIST_NAMES = {f"#k{i}": attr for i, attr in enumerate(_API_KEY_LIST_ATTRIBUTES)}
+
+_serializer = TypeSerializer()
+
+# BatchWriteItem accepts at most 25 requests per call
+_BATCH_WRITE_LIMIT = 25
+_BATCH_MAX_ATTEMPTS = 5
+_BATCH_BACKOFF_BASE = 0.05
+
+def _serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Marshal a plain item dict into DynamoDB AttributeValue form."""
+    serialize = _serializer.serialize
+    return {k: serialize(v) for k, v in item.items()}
+
+# DynamoDB error codes that mean the request was throttled rather than invalid
+_THROTTLING_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded"
+})
+
+class DatabaseThrottledError(RuntimeError):
+    """Raised when DynamoDB rejects a request because of throttling."""
+
+def _db_error(message: str, e: Exception) -> RuntimeError:
+    """Wrap a botocore error, flagging throttling so callers can ask clients to retry."""
+    if isinstance(e, ClientError) and e.response.get("Error", {}).get("Code") in _THROTTLING_ERROR_CODES:
+        return DatabaseThrottledError(f"{message}: {str(e)}")
+    return RuntimeError(f"{message}: {str(e)}")
+
+# Keyed template for API key hashes, copied per key instead of re-keyed
+_key_hmac = hmac.new(settings.API_KEY_PEPPER.encode(), digestmod=hashlib.sha256) if settings.API_KEY_PEPPER else None
+
+@lru_cache(maxsize=1)
 def get_dynamodb_resource() -> Any:
-    """Get DynamoDB resource client."""
+    """Get DynamoDB resource client (created once per process)."""
     return boto3.resource(
         "dynamodb",
-        region_name=settings.AWS_REGION
+        region_name=settings.AWS_REGION,
+        config=boto_config
+    )
+
+@lru_cache(maxsize=1)
+def get_dynamodb_client() -> Any:
+    """Get low-level DynamoDB client (created once per process).
+
+    Unlike the resource's own client, this one does not marshal parameters, so
+    write paths can hand it items already in AttributeValue form.
+    """
+    return boto3.client(
+        "dynamodb",
+        region_name=settings.AWS_REGION,
+        config=boto_config
     )
 
+@lru_cache(maxsize=None)
+def _get_table(name: str) -> Any:
+    """Get a cached DynamoDB Table handle."""
+    return get_dynamodb_resource().Table(name)
+
+def invalidate_apps_cache() -> None:
+    """Drop cached application reads; the write helpers call this after every write."""
+    get_all_apps.cache_clear()
+    count_apps.cache_clear()
+    _get_apps_index.cache_clear()
+    get_app_by_id.cache_clear()
+
 def save_app_record(app_record: Dict[str, Any]) -> None:
     """Save application record to DynamoDB."""
     if not app_record or not isinstance(app_record, dict):
         raise ValueError("Invalid app_record: must be a non-empty dictionary")
     
     try:
-        table = get_dynamodb_resource().Table(settings.APP_CONFIG_TABLE)
-        table.put_item(Item=app_record)
-    except Exception as e:
-        raise RuntimeError(f"Failed to save app record: {str(e)}")
+        get_dynamodb_client().put_item(
+            TableName=settings.APP_CONFIG_TABLE,
+            Item=_serialize_item(app_record)
+        )
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to save app record", e) from e
+    finally:
+        invalidate_apps_cache()
 
+# Invalidation only reaches the worker that wrote, so keep the TTL short
+@ttl_cache(ttl=10, maxsize=1)
 def get_all_apps() -> List[Dict[str, Any]]:
     """Retrieve all application records from DynamoDB."""
     try:
-        table = get_dynamodb_resource().Table(settings.APP_CONFIG_TABLE)
-        response = table.scan()
-        return response.get("Items", [])
-    except Exception as e:
-        raise RuntimeError(f"Failed to retrieve apps: {str(e)}")
-
-def update_app_record(app_id: str, app_record: Dict[str, Any]) -> None:
-    """Update application record in DynamoDB."""
+        paginator = get_dynamodb_resource().meta.client.get_paginator("scan")
+        pages = paginator.paginate(
+            TableName=settings.APP_CONFIG_TABLE,
+            ProjectionExpression=_APP_LIST_PROJECTION,
+            ExpressionAttributeNames=_APP_LIST_NAMES,
+            PaginationConfig={"PageSize": 250}
+        )
+        # The resource's client already unmarshals items into Python types
+        return list(chain.from_iterable(page.get("Items", []) for page in pages))
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to retrieve apps", e) from e
+
+def scan_apps_page(limit: int, exclusive_start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Scan one page of application records, returning (items, LastEvaluatedKey)."""
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+
+    scan_kwargs: Dict[str, Any] = {
+        "Limit": limit,
+        "ProjectionExpression": _APP_LIST_PROJECTION,
+        "ExpressionAttributeNames": _APP_LIST_NAMES
+    }
+    if exclusive_start_key:
+        scan_kwargs["ExclusiveStartKey"] = exclusive_start_key
+    try:
+        response = _get_table(settings.APP_CONFIG_TABLE).scan(**scan_kwargs)
+        return response.get("Items", []), response.get("LastEvaluatedKey")
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to retrieve apps", e) from e
+
+@ttl_cache(ttl=10, maxsize=1)
+def count_apps() -> int:
+    """Count application records with a COUNT-only scan."""
+    try:
+        paginator = get_dynamodb_resource().meta.client.get_paginator("scan")
+        pages = paginator.paginate(TableName=settings.APP_CONFIG_TABLE, Select="COUNT")
+        return sum(page.get("Count", 0) for page in pages)
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to count apps", e) from e
+
+@ttl_cache(ttl=10, maxsize=1024)
+def get_app_by_id(app_id: str) -> Optional[Dict[str, Any]]:
+    """Get a single application record by its Application key or generated id."""
+    if not app_id or not isinstance(app_id, str):
+        raise ValueError("app_id must be a non-empty string")
+    
+    try:
+        table = _get_table(settings.APP_CONFIG_TABLE)
+        response = table.get_item(Key={"Application": app_id})
+        if "Item" in response:
+            return response["Item"]
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to retrieve app", e) from e
+
+    # Fall back to the generated UUID, which is not part of the table key
+    return _get_apps_index().get(app_id)
+
+@ttl_cache(ttl=10, maxsize=1)
+def _get_apps_index() -> Dict[str, Dict[str, Any]]:
+    """Index the cached application list by both generated id and Application key."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for app in get_all_apps():
+        if app.get("id"):
+            index[app["id"]] = app
+        if app.get("Application"):
+            index[app["Application"]] = app
+    return index
+
+def _update_app_item(table: Any, key: str, app_record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """SET the given attributes on an existing item, returning its previous attributes."""
+    fields = [field for field in app_record if field != "Application"]
+    try:
+        response = table.update_item(
+            Key={"Application": key},
+            UpdateExpression="SET " + ", ".join(f"#f{i} = :v{i}" for i in range(len(fields))),
+            ConditionExpression="attribute_exists(Application)",
+            ExpressionAttributeNames={f"#f{i}": field for i, field in enumerate(fields)},
+            ExpressionAttributeValues={f":v{i}": app_record[field] for i, field in enumerate(fields)},
+            ReturnValues="ALL_OLD"
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return None
+        raise
+    return response.get("Attributes")
+
+def update_app_record(app_id: str, app_record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Update application record in DynamoDB.
+
+    Returns the record as it was before the update, or None if no application
+    matches app_id (either its Application key or generated id).
+    """
     if not app_id or not isinstance(app_id, str):
         raise ValueError("app_id must be a non-empty string")
     if not app_record or not isinstance(app_record, dict):
         raise ValueError("Invalid app_record: must be a non-empty dictionary")
-    
+
     try:
-        table = get_dynamodb_resource().Table(settings.APP_CONFIG_TABLE)
-        table.put_item(Item=app_record)
-    except Exception as e:
-        raise RuntimeError(f"Failed to update app record: {str(e)}")
+        table = _get_table(settings.APP_CONFIG_TABLE)
+        old_item = _update_app_item(table, app_id, app_record)
+        if old_item is None:
+            # app_id may be the generated UUID rather than the table key
+            existing = get_app_by_id(app_id)
+            if existing and existing.get("Application") != app_id:
+                old_item = _update_app_item(table, existing["Application"], app_record)
+        return old_item
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to update app record", e) from e
+    finally:
+        invalidate_apps_cache()
 
 def delete_app_record(app_id: str) -> None:
     """Delete application record from DynamoDB."""
@@ -50,15 +227,28 @@ def delete_app_record(app_id: str) -> None:
         raise ValueError("app_id must be a non-empty string")
     
     try:
-        table = get_dynamodb_resource().Table(settings.APP_CONFIG_TABLE)
+        table = _get_table(settings.APP_CONFIG_TABLE)
         table.delete_item(Key={"Application": app_id})
-    except Exception as e:
-        raise RuntimeError(f"Failed to delete app record: {str(e)}")
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to delete app record", e) from e
+    finally:
+        invalidate_apps_cache()
 
 # API Key Management Functions
 
+def hash_api_key(api_key: str) -> str:
+    """Hash an API key for storage, using HMAC-SHA-256 when a pepper is configured."""
+    if _key_hmac is None:
+        return hashlib.sha256(api_key.encode()).hexdigest()
+    key_hash = _key_hmac.copy()
+    key_hash.update(api_key.encode())
+    return key_hash.hexdigest()
+
 def save_api_key(api_key_record: Dict[str, Any]) -> None:
-    """Save API key record to DynamoDB with hashed key for secure lookup."""
+    """Save API key record to DynamoDB with hashed key for secure lookup.
+
+    The plaintext api_key is replaced by its key_hash and never stored.
+    """
     if not api_key_record or not isinstance(api_key_record, dict):
         raise ValueError("Invalid api_key_record: must be a non-empty dictionary")
     
@@ -68,56 +258,117 @@ def save_api_key(api_key_record: Dict[str, Any]) -> None:
     
     # Generate key_hash for secure lookup (required by Lambda auth function)
     if "api_key" in api_key_record:
-        api_key_value = api_key_record["api_key"]
-        key_hash = hashlib.sha256(api_key_value.encode()).hexdigest()
-        api_key_record["key_hash"] = key_hash
+        api_key_record["key_hash"] = hash_api_key(api_key_record["api_key"])
+    item = {k: v for k, v in api_key_record.items() if k != "api_key"}
     
     try:
-        table = get_dynamodb_resource().Table(settings.API_KEYS_TABLE)
-        table.put_item(Item=api_key_record)
-    except Exception as e:
-        raise RuntimeError(f"Failed to save API key record: {str(e)}")
+        get_dynamodb_client().put_item(
+            TableName=settings.API_KEYS_TABLE,
+            Item=_serialize_item(item)
+        )
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to save API key record", e) from e
+
+def _query_api_keys_page(app_id: str, forward: bool, start_key: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Query one page of API keys for an application in the given sort direction."""
+    query_kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "app_id = :app_id",
+        "ExpressionAttributeValues": {":app_id": app_id},
+        "ProjectionExpression": _API_KEY_LIST_PROJECTION,
+        "ExpressionAttributeNames": _API_KEY_LIST_NAMES,
+        "ScanIndexForward": forward
+    }
+    if start_key:
+        query_kwargs["ExclusiveStartKey"] = start_key
+    return _get_table(settings.API_KEYS_TABLE).query(**query_kwargs)
 
 def get_api_keys_for_app(app_id: str) -> List[Dict[str, Any]]:
-    """Get all API keys for a specific application."""
+    """Get all API keys for a specific application, without the key material.
+
+    Small key sets come back in a single page. When the first page is truncated,
+    the remaining range is read from both ends concurrently until they meet.
+    """
     if not app_id or not isinstance(app_id, str):
         raise ValueError("app_id must be a non-empty string")
     
     try:
-        table = get_dynamodb_resource().Table(settings.API_KEYS_TABLE)
-        response = table.query(
-            KeyConditionExpression="app_id = :app_id",
-            ExpressionAttributeValues={
-                ":app_id": app_id
-            }
-        )
-        return response.get("Items", [])
-    except Exception as e:
-        raise RuntimeError(f"Failed to retrieve API keys: {str(e)}")
+        response = _query_api_keys_page(app_id, forward=True)
+        forward_items = response.get("Items", [])
+        forward_key = response.get("LastEvaluatedKey")
+        if not forward_key:
+            return forward_items
+        
+        reverse_items: List[Dict[str, Any]] = []
+        reverse_key = None
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            while True:
+                forward_future = pool.submit(_query_api_keys_page, app_id, True, forward_key)
+                reverse_future = pool.submit(_query_api_keys_page, app_id, False, reverse_key)
+                forward_page = forward_future.result()
+                reverse_page = reverse_future.result()
+                forward_items.extend(forward_page.get("Items", []))
+                reverse_items.extend(reverse_page.get("Items", []))
+                forward_key = forward_page.get("LastEvaluatedKey")
+                reverse_key = reverse_page.get("LastEvaluatedKey")
+                
+                if not forward_key or not reverse_key:
+                    break
+                if forward_items and reverse_items and forward_items[-1]["id"] >= reverse_items[-1]["id"]:
+                    break
+        
+        # Stitch both halves back together in ascending order, dropping overlap
+        if not forward_key:
+            return forward_items
+        if not reverse_key:
+            return list(reversed(reverse_items))
+        last_forward_id = forward_items[-1]["id"]
+        return forward_items + [item for item in reversed(reverse_items) if item["id"] > last_forward_id]
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to retrieve API keys", e) from e
 
-def get_api_key_by_id(app_id: str, key_id: str) -> Optional[Dict[str, Any]]:
-    """Get API key by app_id and key_id (composite key)."""
+def delete_api_key(app_id: str, key_id: str) -> bool:
+    """Delete/revoke API key using composite key. Returns False if the key did not exist."""
     if not app_id or not isinstance(app_id, str):
         raise ValueError("app_id must be a non-empty string")
     if not key_id or not isinstance(key_id, str):
         raise ValueError("key_id must be a non-empty string")
     
     try:
-        table = get_dynamodb_resource().Table(settings.API_KEYS_TABLE)
-        response = table.get_item(Key={"app_id": app_id, "id": key_id})
-        return response.get("Item")
-    except Exception as e:
-        raise RuntimeError(f"Failed to retrieve API key: {str(e)}")
-
-def delete_api_key(app_id: str, key_id: str) -> None:
-    """Delete/revoke API key using composite key."""
+        table = _get_table(settings.API_KEYS_TABLE)
+        table.delete_item(
+            Key={"app_id": app_id, "id": key_id},
+            ConditionExpression="attribute_exists(id)"
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise _db_error("Failed to delete API key", e) from e
+    except BotoCoreError as e:
+        raise _db_error("Failed to delete API key", e) from e
+
+def batch_delete_api_keys(app_id: str, key_ids: List[str]) -> None:
+    """Delete many API keys of one application with BatchWriteItem (25 keys per call)."""
     if not app_id or not isinstance(app_id, str):
         raise ValueError("app_id must be a non-empty string")
-    if not key_id or not isinstance(key_id, str):
-        raise ValueError("key_id must be a non-empty string")
-    
+
+    client = get_dynamodb_client()
     try:
-        table = get_dynamodb_resource().Table(settings.API_KEYS_TABLE)
-        table.delete_item(Key={"app_id": app_id, "id": key_id})
-    except Exception as e:
-        raise RuntimeError(f"Failed to delete API key: {str(e)}")
+        for start in range(0, len(key_ids), _BATCH_WRITE_LIMIT):
+            request_items: Dict[str, Any] = {
+                settings.API_KEYS_TABLE: [
+                    {"DeleteRequest": {"Key": {"app_id": {"S": app_id}, "id": {"S": key_id}}}}
+                    for key_id in key_ids[start:start + _BATCH_WRITE_LIMIT]
+                ]
+            }
+            # Retry throttled leftovers with exponential backoff
+            for attempt in range(_BATCH_MAX_ATTEMPTS):
+                response = client.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems") or {}
+                if not request_items:
+                    break
+                time.sleep(_BATCH_BACKOFF_BASE * (2 ** attempt))
+            else:
+                raise DatabaseThrottledError("Failed to delete API keys: unprocessed items remain after retries")
+    except (BotoCoreError, ClientError) as e:
+        raise _db_error("Failed to delete API keys", e) from e
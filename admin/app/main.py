@@ -1,37 +1,59 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from fastapi.middleware.cors import CORSMiddleware
-import secrets
-import string
+from fastapi.responses import ORJSONResponse
+import asyncio
+import base64
+import binascii
+import ciso8601
+import orjson
+import os
 from datetime import datetime, timezone
-from typing import Optional, List
-from .db import save_app_record, get_all_apps, update_app_record, delete_app_record, save_api_key, get_api_keys_for_app, delete_api_key, get_api_key_by_id
+from typing import Any, Dict, Optional, List
+from uuid import uuid4
+from .config import settings
+from .db import DatabaseThrottledError, save_app_record, scan_apps_page, count_apps, get_app_by_id, update_app_record, delete_app_record, save_api_key, get_api_keys_for_app, delete_api_key, batch_delete_api_keys
 
 app = FastAPI(
     title="Application API Key Manager",
     description="API for managing applications and their API keys",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware - matches server.py configuration
+# CORS middleware - origins from ALLOWED_ORIGINS, as in server.py. Credentials
+# are only allowed with an explicit origin list: combined with "*", Starlette
+# has to echo each request's Origin header back instead of sending "*".
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["Content-Type", "Authorization", "X-API-Key", "Accept"],
-    expose_headers=["Content-Type", "X-Total-Count"],
-    max_age=3600,
+    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_credentials=settings.ALLOWED_ORIGINS != ["*"],
+    # OPTIONS (preflight) and the safelisted Accept header are always allowed
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+    allow_headers=["Content-Type", "X-API-Key"],
+    expose_headers=["Content-Type", "X-Total-Count", "X-Next-Cursor"],
+    max_age=86400,  # Cache preflights for 24h (browsers may cap this lower)
 )
 
-# Models matching server.py
+@app.exception_handler(DatabaseThrottledError)
+async def database_throttled_handler(request: Request, exc: DatabaseThrottledError) -> ORJSONResponse:
+    """Report DynamoDB throttling as 429 so clients retry later"""
+    return ORJSONResponse(status_code=429, content={"detail": f"Database is busy, retry later: {exc}"})
+
+# Models matching server.py. Responses are built from trusted, already-typed
+# values, so handlers use model_construct and leave validation to FastAPI's
+# response_model check.
 class ApplicationCreate(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+
     App_name: str = Field(..., min_length=1, max_length=255)
     Application: str
     Email: str
     Domain: str
 
 class ApplicationResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True, extra="ignore")
+
     id: str
     name: str
     application_id: str
@@ -45,6 +67,8 @@ class APIKeyCreate(BaseModel):
     expires_at: Optional[datetime] = None
 
 class APIKeyResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True, extra="ignore")
+
     id: str
     api_key: str
     name: Optional[str]
@@ -52,6 +76,8 @@ class APIKeyResponse(BaseModel):
     expires_at: Optional[datetime]
 
 class APIKeyInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True, extra="ignore")
+
     id: str
     name: Optional[str]
     created_at: datetime
@@ -59,6 +85,36 @@ class APIKeyInfo(BaseModel):
     last_used_at: Optional[datetime]
     is_active: bool
 
+_API_KEY_PREFIX = b"sk_"
+_b64encode = base64.urlsafe_b64encode
+
+# Validates a whole key listing in a single pydantic-core pass
+_APIKeyListAdapter = TypeAdapter(List[APIKeyInfo])
+
+def _encode_cursor(last_key: Dict[str, Any]) -> str:
+    """Encode a DynamoDB LastEvaluatedKey as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps(last_key)).decode()
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by _encode_cursor, raising ValueError if it is malformed."""
+    try:
+        start_key = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, orjson.JSONDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    # Exactly the table's key, so a tampered cursor is a 400 rather than a DynamoDB error
+    if not isinstance(start_key, dict) or start_key.keys() != {"Application"} \
+            or not isinstance(start_key["Application"], str) or not start_key["Application"]:
+        raise ValueError("Malformed cursor")
+    return start_key
+
+def _new_api_key() -> str:
+    """Generate an sk_-prefixed key from 32 random bytes (same format as secrets.token_urlsafe)."""
+    return (_API_KEY_PREFIX + _b64encode(os.urandom(32)).rstrip(b"=")).decode("ascii")
+
+def _parse_timestamp(value: Optional[str], default: datetime) -> datetime:
+    """Parse a stored ISO-8601 timestamp, falling back to default when it is missing."""
+    return ciso8601.parse_datetime(value) if value else default
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -85,11 +141,10 @@ async def health_check():
 async def create_application(app_data: ApplicationCreate):
     """Create a new application"""
     try:
-        import uuid
-        
         # Generate unique ID
-        app_id = str(uuid.uuid4())
+        app_id = str(uuid4())
         now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
         
         # Create application record using existing database schema
         app_record = {
@@ -102,14 +157,14 @@ async def create_application(app_data: ApplicationCreate):
             "application_id": app_data.Application,  # For server.py compatibility
             "email": app_data.Email,  # For server.py compatibility
             "domain": app_data.Domain,  # For server.py compatibility
-            "created_at": now.isoformat(),
-            "updated_at": now.isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
-        save_app_record(app_record)
+        await asyncio.to_thread(save_app_record, app_record)
         
         # Return response matching server.py format
-        return ApplicationResponse(
+        return ApplicationResponse.model_construct(
             id=app_id,
             name=app_data.App_name,
             application_id=app_data.Application,
@@ -118,29 +173,53 @@ async def create_application(app_data: ApplicationCreate):
             created_at=now,
             updated_at=now
         )
+    except DatabaseThrottledError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create application: {str(e)}")
 
 @app.get("/apps", response_model=List[ApplicationResponse])
-async def list_applications(skip: int = 0, limit: int = 100):
-    """List all applications"""
+async def list_applications(response: Response, limit: int = Query(100, ge=1, le=1000), cursor: Optional[str] = None,
+                            include_total: bool = False):
+    """List applications one page at a time.
+
+    Pass the X-Next-Cursor header of a response as cursor to fetch the next page.
+    include_total=true adds X-Total-Count, at the cost of a COUNT scan of the table.
+    """
+    try:
+        start_key = _decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     try:
-        apps_data = get_all_apps()
+        if include_total:
+            (apps_data, last_key), total = await asyncio.gather(
+                asyncio.to_thread(scan_apps_page, limit, start_key),
+                asyncio.to_thread(count_apps)
+            )
+            response.headers["X-Total-Count"] = str(total)
+        else:
+            apps_data, last_key = await asyncio.to_thread(scan_apps_page, limit, start_key)
+        now = datetime.now(timezone.utc)
         
         # Convert to response models matching server.py format
         apps = []
-        for item in apps_data[skip:skip+limit]:
-            apps.append(ApplicationResponse(
+        for item in apps_data:
+            apps.append(ApplicationResponse.model_construct(
                 id=item.get("id", item.get("Application", "")),
                 name=item.get("name", item.get("App_name", "")),
                 application_id=item.get("application_id", item.get("Application", "")),
                 email=item.get("email", item.get("Email", "")),
                 domain=item.get("domain", item.get("Domain", "")),
-                created_at=datetime.fromisoformat(item.get("created_at", datetime.now(timezone.utc).isoformat())),
-                updated_at=datetime.fromisoformat(item.get("updated_at", datetime.now(timezone.utc).isoformat()))
+                created_at=_parse_timestamp(item.get("created_at"), now),
+                updated_at=_parse_timestamp(item.get("updated_at"), now)
             ))
         
+        if last_key:
+            response.headers["X-Next-Cursor"] = _encode_cursor(last_key)
         return apps
+    except DatabaseThrottledError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list applications: {str(e)}")
 
@@ -148,22 +227,22 @@ async def list_applications(skip: int = 0, limit: int = 100):
 async def get_application(app_id: str):
     """Get a specific application"""
     try:
-        apps = get_all_apps()
-        app_item = next((app for app in apps if app.get("id") == app_id or app.get("Application") == app_id), None)
+        app_item = await asyncio.to_thread(get_app_by_id, app_id)
         
         if not app_item:
             raise HTTPException(status_code=404, detail="Application not found")
         
-        return ApplicationResponse(
+        now = datetime.now(timezone.utc)
+        return ApplicationResponse.model_construct(
             id=app_item.get("id", app_item.get("Application", "")),
             name=app_item.get("name", app_item.get("App_name", "")),
             application_id=app_item.get("application_id", app_item.get("Application", "")),
             email=app_item.get("email", app_item.get("Email", "")),
             domain=app_item.get("domain", app_item.get("Domain", "")),
-            created_at=datetime.fromisoformat(app_item.get("created_at", datetime.now(timezone.utc).isoformat())),
-            updated_at=datetime.fromisoformat(app_item.get("updated_at", datetime.now(timezone.utc).isoformat()))
+            created_at=_parse_timestamp(app_item.get("created_at"), now),
+            updated_at=_parse_timestamp(app_item.get("updated_at"), now)
         )
-    except HTTPException:
+    except (HTTPException, DatabaseThrottledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get application: {str(e)}")
@@ -173,26 +252,28 @@ async def update_application(app_id: str, app_data: ApplicationCreate):
     """Update an existing application"""
     try:
         now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
         
-        # Create updated application record matching server.py format
+        # Updated attributes in both the existing schema and server.py format
         app_record = {
-            "id": app_id,
+            "App_name": app_data.App_name,
+            "Email": app_data.Email,
+            "Domain": app_data.Domain,
             "name": app_data.App_name,
             "application_id": app_data.Application,
             "email": app_data.Email,
             "domain": app_data.Domain,
-            "updated_at": now.isoformat()
+            "updated_at": now_iso
         }
-        
-        update_app_record(app_id, app_record)
-        
-        # Get existing created_at
-        apps = get_all_apps()
-        existing_app = next((app for app in apps if app.get("id") == app_id or app.get("Application") == app_id), None)
-        created_at = datetime.fromisoformat(existing_app.get("created_at", now.isoformat())) if existing_app else now
-        
-        return ApplicationResponse(
-            id=app_id,
+
+        # The previous attributes come back from the same UpdateItem call
+        existing_app = await asyncio.to_thread(update_app_record, app_id, app_record)
+        if existing_app is None:
+            raise HTTPException(status_code=404, detail="Application not found")
+        created_at = _parse_timestamp(existing_app.get("created_at"), now)
+
+        return ApplicationResponse.model_construct(
+            id=existing_app.get("id", app_id),
             name=app_data.App_name,
             application_id=app_data.Application,
             email=app_data.Email,
@@ -200,7 +281,7 @@ async def update_application(app_id: str, app_data: ApplicationCreate):
             created_at=created_at,
             updated_at=now
         )
-    except HTTPException:
+    except (HTTPException, DatabaseThrottledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update application: {str(e)}")
@@ -211,17 +292,16 @@ async def delete_application(app_id: str):
     try:
         # Delete all API keys for this application
         try:
-            keys = get_api_keys_for_app(app_id)
-            for key in keys:
-                delete_api_key(app_id, key["id"])
+            keys = await asyncio.to_thread(get_api_keys_for_app, app_id)
+            await asyncio.to_thread(batch_delete_api_keys, app_id, [key["id"] for key in keys])
         except Exception:
             pass  # Continue even if no keys found
         
         # Delete the application
-        delete_app_record(app_id)
+        await asyncio.to_thread(delete_app_record, app_id)
         
         return None
-    except HTTPException:
+    except (HTTPException, DatabaseThrottledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete application: {str(e)}")
@@ -232,17 +312,14 @@ async def delete_application(app_id: str):
 async def generate_api_key(app_id: str, key_data: APIKeyCreate = APIKeyCreate()):
     """Generate a new API key for an application"""
     try:
-        import uuid
-        
         # Verify application exists
-        apps = get_all_apps()
-        app = next((app for app in apps if app.get("id") == app_id or app.get("Application") == app_id), None)
+        app = await asyncio.to_thread(get_app_by_id, app_id)
         if not app:
             raise HTTPException(status_code=404, detail="Application not found")
         
         # Generate a secure random API key matching server.py format
-        api_key = f"sk_{secrets.token_urlsafe(32)}"
-        key_id = str(uuid.uuid4())
+        api_key = _new_api_key()
+        key_id = str(uuid4())
         now = datetime.now(timezone.utc)
         
         api_key_record = {
@@ -256,16 +333,16 @@ async def generate_api_key(app_id: str, key_data: APIKeyCreate = APIKeyCreate())
             "is_active": True
         }
         
-        save_api_key(api_key_record)
+        await asyncio.to_thread(save_api_key, api_key_record)
         
-        return APIKeyResponse(
+        return APIKeyResponse.model_construct(
             id=key_id,
             api_key=api_key,
             name=api_key_record["name"],
             created_at=now,
             expires_at=key_data.expires_at
         )
-    except HTTPException:
+    except (HTTPException, DatabaseThrottledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate API key: {str(e)}")
@@ -274,25 +351,26 @@ async def generate_api_key(app_id: str, key_data: APIKeyCreate = APIKeyCreate())
 async def list_api_keys(app_id: str):
     """List all API keys for an application (without showing the actual keys)"""
     try:
-        # Check if application exists
-        apps = get_all_apps()
-        app = next((app for app in apps if app.get("id") == app_id or app.get("Application") == app_id), None)
+        # Look up the application and its keys concurrently
+        app, keys = await asyncio.gather(
+            asyncio.to_thread(get_app_by_id, app_id),
+            asyncio.to_thread(get_api_keys_for_app, app_id)
+        )
         if not app:
             raise HTTPException(status_code=404, detail="Application not found")
         
-        keys = get_api_keys_for_app(app_id)
-        return [
-            APIKeyInfo(
-                id=key["id"],
-                name=key.get("name"),
-                created_at=datetime.fromisoformat(key["created_at"]),
-                expires_at=datetime.fromisoformat(key["expires_at"]) if key.get("expires_at") else None,
-                last_used_at=datetime.fromisoformat(key["last_used_at"]) if key.get("last_used_at") else None,
-                is_active=key.get("is_active", True)
-            )
+        return _APIKeyListAdapter.validate_python([
+            {
+                "id": key["id"],
+                "name": key.get("name"),
+                "created_at": key["created_at"],
+                "expires_at": key.get("expires_at") or None,
+                "last_used_at": key.get("last_used_at") or None,
+                "is_active": key.get("is_active", True)
+            }
             for key in keys
-        ]
-    except HTTPException:
+        ])
+    except (HTTPException, DatabaseThrottledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list API keys: {str(e)}")
@@ -301,14 +379,11 @@ async def list_api_keys(app_id: str):
 async def revoke_api_key(app_id: str, key_id: str):
     """Revoke (deactivate) an API key"""
     try:
-        # Get the key to verify it exists
-        key_record = get_api_key_by_id(app_id, key_id)
-        if not key_record:
+        # Conditional delete checks existence in the same round trip
+        if not await asyncio.to_thread(delete_api_key, app_id, key_id):
             raise HTTPException(status_code=404, detail="API key not found")
-        
-        delete_api_key(app_id, key_id)
         return None
-    except HTTPException:
+    except (HTTPException, DatabaseThrottledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to revoke API key: {str(e)}")
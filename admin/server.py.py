@@ -3,17 +3,27 @@ FastAPI Backend with API Key Generation
 Complete backend service for managing applications and API keys
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
 from decimal import Decimal
+import asyncio
+import base64
+import binascii
+import json
 import secrets
 import hashlib
 import os
+import re
+import threading
+import time
 import uuid
 import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # # Testing mode setup
@@ -36,23 +46,76 @@ DYNAMODB_ENDPOINT = os.getenv("DYNAMODB_ENDPOINT")  # For local development
 APPLICATIONS_TABLE = os.getenv("APPLICATIONS_TABLE", "applications")
 API_KEYS_TABLE = os.getenv("API_KEYS_TABLE", "YANTECH-YNP01-AWS-DYNAMODB-API-KEYS-DEV")
 
-# Initialize DynamoDB resource
-dynamodb_config = {"region_name": AWS_REGION}
+# In-process cache of API key records looked up by hash. A revoked key stays
+# valid for up to API_KEY_CACHE_TTL seconds on other worker processes.
+API_KEY_CACHE_TTL = int(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+API_KEY_CACHE_MAXSIZE = 10000
+_key_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+_key_cache_ids: Dict[Tuple[str, str], str] = {}
+_key_cache_lock = threading.Lock()
+
+# Seconds to cache GET /apps, /app/{id} and /app/{id}/api-keys responses (0 disables)
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "10"))
+
+# Attributes returned by the list endpoints; everything else (e.g. key_hash)
+# is left out of the read
+APP_LIST_ATTRIBUTES = ("id", "name", "application_id", "email", "domain", "created_at", "updated_at")
+APP_LIST_PROJECTION = {
+    "ProjectionExpression": ", ".join(f"#a{i}" for i in range(len(APP_LIST_ATTRIBUTES))),
+    "ExpressionAttributeNames": {f"#a{i}": attr for i, attr in enumerate(APP_LIST_ATTRIBUTES)}
+}
+API_KEY_LIST_ATTRIBUTES = ("id", "name", "created_at", "expires_at", "last_used_at", "is_active")
+API_KEY_LIST_PROJECTION = {
+    "ProjectionExpression": ", ".join(f"#k{i}" for i in range(len(API_KEY_LIST_ATTRIBUTES))),
+    "ExpressionAttributeNames": {f"#k{i}": attr for i, attr in enumerate(API_KEY_LIST_ATTRIBUTES)}
+}
+
+# Attributes key verification and last_used_at tracking need
+API_KEY_AUTH_ATTRIBUTES = ("app_id", "id", "name", "is_active", "expires_at", "last_used_at")
+API_KEY_AUTH_PROJECTION = {
+    "ProjectionExpression": ", ".join(f"#v{i}" for i in range(len(API_KEY_AUTH_ATTRIBUTES))),
+    "ExpressionAttributeNames": {f"#v{i}": attr for i, attr in enumerate(API_KEY_AUTH_ATTRIBUTES)}
+}
+
+# Public prefix of every issued API key
+API_KEY_PREFIX = "sk_"
+
+# Minimum time between last_used_at writes for the same API key
+LAST_USED_INTERVAL = timedelta(seconds=int(os.getenv("LAST_USED_INTERVAL_SECONDS", "60")))
+
+# Initialize DynamoDB resource with a pooled, keep-alive connection set so
+# concurrent requests (now run in worker threads) don't queue on 10 sockets
+dynamodb_config = {
+    "region_name": AWS_REGION,
+    "config": Config(
+        max_pool_connections=100,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        tcp_keepalive=True
+    )
+}
 if DYNAMODB_ENDPOINT and os.getenv("TESTING") != "true":
     dynamodb_config["endpoint_url"] = DYNAMODB_ENDPOINT
 
 dynamodb = boto3.resource("dynamodb", **dynamodb_config)
 dynamodb_client = boto3.client("dynamodb", **dynamodb_config)
 
+# Optional DAX cluster for the API key verification query (amazon-dax-client).
+# DAX does not invalidate its query cache on writes, so keep the cluster's
+# query TTL no longer than API_KEY_CACHE_TTL_SECONDS to bound revocation delay.
+DAX_ENDPOINT = os.getenv("DAX_ENDPOINT")
+if DAX_ENDPOINT and os.getenv("TESTING") != "true":
+    from amazondax import AmazonDaxClient
+    dax = AmazonDaxClient(endpoint_url=DAX_ENDPOINT, region_name=AWS_REGION)
+else:
+    dax = None
+
 
 # Helper function to convert datetime to ISO string for DynamoDB
 def datetime_to_str(dt: Optional[datetime]) -> Optional[str]:
     """Convert datetime to ISO format string"""
     if dt is None:
         return None
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.isoformat()
+    return dt.isoformat() if dt.tzinfo else dt.replace(tzinfo=timezone.utc).isoformat()
 
 
 def str_to_datetime(s: Optional[str]) -> Optional[datetime]:
@@ -150,9 +213,12 @@ def init_dynamodb_tables():
         raise
 
 
-# Initialize tables on startup (skip in testing)
-if os.getenv("TESTING") != "true":
-    init_dynamodb_tables()
+# Table handles shared by all requests
+applications_table = dynamodb.Table(APPLICATIONS_TABLE)
+api_keys_table = dynamodb.Table(API_KEYS_TABLE)
+# Low-level client for the key verification hot path, which skips the
+# resource layer's per-attribute unmarshalling; served through DAX when configured
+auth_dynamodb_client = dax or dynamodb_client
 
 # Pydantic Models
 class ApplicationCreate(BaseModel):
@@ -194,31 +260,234 @@ class APIKeyInfo(BaseModel):
     is_active: bool
 
 
+# Response cache for the read endpoints
+class ResponseCache:
+    """Stored GET responses, shared by the middleware and anything that clears it."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.entries: Dict[Tuple[str, bytes], Tuple[float, Dict[str, Any], bytes]] = {}
+        # Bumped on every clear so responses read before a write are never stored
+        self.generation = 0
+
+    def clear(self) -> None:
+        """Drop every stored response."""
+        self.generation += 1
+        self.entries.clear()
+
+
+class ResponseCacheMiddleware:
+    """Serve repeated GETs of cacheable paths from memory for a short TTL.
+
+    A successful POST, PUT, PATCH or DELETE on a path matching
+    invalidate_pattern clears the whole cache, so a worker always sees its
+    own writes; other workers may serve stale reads for up to ttl. Other
+    requests (e.g. POST /verify-key, HEAD) leave the cache alone.
+    """
+
+    MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+    def __init__(self, app, ttl: float, path_pattern: str, invalidate_pattern: str, cache: ResponseCache):
+        self.app = app
+        self.ttl = ttl
+        self.path_pattern = re.compile(path_pattern)
+        self.invalidate_pattern = re.compile(invalidate_pattern)
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.ttl <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        cache = self.cache
+        if scope["method"] in self.MUTATING_METHODS and self.invalidate_pattern.match(scope["path"]):
+            async def send_and_invalidate(message):
+                if message["type"] == "http.response.start" and message["status"] < 400:
+                    cache.clear()
+                await send(message)
+
+            await self.app(scope, receive, send_and_invalidate)
+            return
+
+        if scope["method"] != "GET" or not self.path_pattern.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope["query_string"])
+        entry = cache.entries.get(key)
+        if entry is not None:
+            expires, start_message, body = entry
+            if expires > time.monotonic():
+                # Outer middleware (e.g. CORS) edits headers in place, so each hit gets a copy
+                await send({**start_message, "headers": list(start_message["headers"])})
+                await send({"type": "http.response.body", "body": body})
+                return
+            cache.entries.pop(key, None)
+
+        generation = cache.generation
+        start_message: Dict[str, Any] = {}
+        body_parts: List[bytes] = []
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                # Snapshot the headers before outer middleware adds CORS headers to them
+                start_message.update(message, headers=list(message.get("headers", ())))
+            elif message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+                # Only complete 200 responses from before any write are stored
+                if (not message.get("more_body", False) and start_message.get("status") == 200
+                        and generation == cache.generation):
+                    while len(cache.entries) >= cache.maxsize:
+                        cache.entries.pop(next(iter(cache.entries)))
+                    cache.entries[key] = (time.monotonic() + self.ttl, start_message, b"".join(body_parts))
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+
+class KnownOriginCORSMiddleware:
+    """CORS for a fixed list of origins with every response header prebuilt.
+
+    Behaves like CORSMiddleware with explicit origins and credentials, but
+    resolves each request with one dict lookup instead of re-parsing headers.
+    Development ("*") keeps the stock CORSMiddleware.
+    """
+
+    SAFELISTED_HEADERS = ("Accept", "Accept-Language", "Content-Language", "Content-Type")
+
+    def __init__(self, app, allow_origins: List[str], allow_methods: List[str],
+                 allow_headers: List[str], expose_headers: List[str], max_age: int = 600):
+        self.app = app
+        self.allow_methods = frozenset(method.encode() for method in allow_methods)
+        allow_headers = sorted(set(self.SAFELISTED_HEADERS) | set(allow_headers))
+        self.allow_headers = frozenset(header.lower().encode() for header in allow_headers)
+
+        base_headers = [(b"access-control-allow-credentials", b"true")]
+        if expose_headers:
+            base_headers.append((b"access-control-expose-headers", ", ".join(expose_headers).encode()))
+        preflight_headers = [
+            (b"vary", b"Origin"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode()),
+            (b"access-control-allow-credentials", b"true"),
+            (b"content-type", b"text/plain; charset=utf-8")
+        ]
+
+        # Responses to unknown origins carry the base headers only, like CORSMiddleware
+        self.unknown_origin_headers = base_headers
+        self.simple_headers: Dict[bytes, List[Tuple[bytes, bytes]]] = {}
+        self.preflight_messages: Dict[bytes, Dict[str, Any]] = {}
+        for origin in allow_origins:
+            origin_bytes = origin.encode("latin-1")
+            allow_origin = (b"access-control-allow-origin", origin_bytes)
+            self.simple_headers[origin_bytes] = [*base_headers, allow_origin, (b"vary", b"Origin")]
+            self.preflight_messages[origin_bytes] = {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [*preflight_headers, allow_origin, (b"content-length", b"2")]
+            }
+        self.preflight_failure_headers = preflight_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight_response(send, origin, request_method, request_headers)
+            return
+
+        cors_headers = self.simple_headers.get(origin, self.unknown_origin_headers)
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                # Copy rather than extend: the response cache may hold this list
+                message = {**message, "headers": [*message.get("headers", ()), *cors_headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight_response(self, send, origin: bytes, request_method: bytes,
+                                 request_headers: Optional[bytes]) -> None:
+        failures = []
+        if origin not in self.preflight_messages:
+            failures.append("origin")
+        if request_method not in self.allow_methods:
+            failures.append("method")
+        if request_headers and any(
+            header.strip().lower() not in self.allow_headers for header in request_headers.split(b",")
+        ):
+            failures.append("headers")
+
+        if not failures:
+            await send(self.preflight_messages[origin])
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        body = f"Disallowed CORS {', '.join(failures)}".encode()
+        headers = [*self.preflight_failure_headers, (b"content-length", str(len(body)).encode())]
+        if origin in self.preflight_messages:
+            headers.append((b"access-control-allow-origin", origin))
+        await send({"type": "http.response.start", "status": 400, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
 # FastAPI App
 app = FastAPI(
     title="Application API Key Manager",
     description="API for managing applications and their API keys",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
+
+# Response cache - added before CORS so it runs inside it and never stores
+# per-origin CORS headers
+response_cache = ResponseCache()
+app.add_middleware(
+    ResponseCacheMiddleware,
+    ttl=RESPONSE_CACHE_TTL,
+    path_pattern=r"^/(apps|app/[^/]+|app/[^/]+/api-keys)$",
+    invalidate_pattern=r"^/app(/|$)",
+    cache=response_cache
 )
 
 # CORS middleware - configured via ALLOWED_ORIGINS environment variable
 # For production, set ALLOWED_ORIGINS to your S3 bucket URL or CloudFront domain
 # Example: ALLOWED_ORIGINS=https://your-bucket.s3.amazonaws.com,https://your-cloudfront-domain.com
-app.add_middleware(
-    CORSMiddleware,
+cors_options = dict(
     allow_origins=ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["Content-Type", "Authorization", "X-API-Key", "Accept"],
-    expose_headers=["Content-Type", "X-Total-Count"],
-    max_age=3600,  # Cache preflight requests for 1 hour
+    # OPTIONS (preflight) and the safelisted Accept header are always allowed
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+    allow_headers=["Content-Type", "X-API-Key"],
+    expose_headers=["Content-Type", "X-Total-Count", "X-Next-Cursor"],
+    max_age=86400,  # Cache preflights for 24h (browsers may cap this lower)
 )
+if ALLOWED_ORIGINS == ["*"]:
+    app.add_middleware(CORSMiddleware, allow_credentials=True, **cors_options)
+else:
+    app.add_middleware(KnownOriginCORSMiddleware, **cors_options)
 
 
-# Dependency
-def get_dynamodb():
-    """Dependency to get DynamoDB resource"""
-    return dynamodb
+@app.on_event("startup")
+async def create_tables_on_startup():
+    """Create tables when AUTO_CREATE_TABLES=true (local development only;
+    deployed tables are provisioned by infrastructure)"""
+    if os.getenv("AUTO_CREATE_TABLES") == "true" and os.getenv("TESTING") != "true":
+        await asyncio.to_thread(init_dynamodb_tables)
 
 
 # Utility Functions
@@ -227,25 +496,110 @@ def hash_api_key(api_key: str) -> str:
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
+def encode_cursor(last_evaluated_key: Dict[str, Any]) -> str:
+    """Encode a DynamoDB LastEvaluatedKey as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(json.dumps(last_evaluated_key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a pagination cursor back into an ExclusiveStartKey"""
+    try:
+        start_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+    # Exactly the table's key, so a tampered cursor is a 400 rather than a DynamoDB error
+    if not isinstance(start_key, dict) or start_key.keys() != {"id"} \
+            or not isinstance(start_key["id"], str) or not start_key["id"]:
+        raise ValueError("Malformed cursor")
+    return start_key
+
+
+def get_cached_key_record(key_hash: str) -> Optional[Dict[str, Any]]:
+    """Return a cached API key record by hash, or None if missing or expired"""
+    with _key_cache_lock:
+        entry = _key_cache.get(key_hash)
+        if entry is None:
+            return None
+        key_record, expires = entry
+        if expires <= time.monotonic():
+            _evict_key_hash(key_hash)
+            return None
+        return key_record
+
+
+def cache_key_record(key_hash: str, key_record: Dict[str, Any]) -> None:
+    """Cache an API key record by hash for API_KEY_CACHE_TTL seconds"""
+    with _key_cache_lock:
+        _evict_key_hash(key_hash)
+        while len(_key_cache) >= API_KEY_CACHE_MAXSIZE:
+            _evict_key_hash(next(iter(_key_cache)))
+        _key_cache[key_hash] = (key_record, time.monotonic() + API_KEY_CACHE_TTL)
+        _key_cache_ids[(key_record["app_id"], key_record["id"])] = key_hash
+
+
+def invalidate_cached_keys(app_id: str, key_id: Optional[str] = None) -> None:
+    """Drop cached records for one API key, or for every key of an application"""
+    with _key_cache_lock:
+        if key_id is not None:
+            key_hash = _key_cache_ids.get((app_id, key_id))
+            if key_hash:
+                _evict_key_hash(key_hash)
+            return
+        for ids in [ids for ids in _key_cache_ids if ids[0] == app_id]:
+            _evict_key_hash(_key_cache_ids[ids])
+
+
+def _evict_key_hash(key_hash: str) -> None:
+    """Remove a cache entry and its reverse mapping; caller holds _key_cache_lock"""
+    entry = _key_cache.pop(key_hash, None)
+    if entry is not None:
+        key_record = entry[0]
+        _key_cache_ids.pop((key_record["app_id"], key_record["id"]), None)
+
+
+def key_record_from_item(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Unwrap a low-level API key item; the projected attributes are strings,
+    booleans or NULL, so the generic deserializer is only a fallback"""
+    key_record = {}
+    for attr, value in item.items():
+        if "S" in value:
+            key_record[attr] = value["S"]
+        elif "BOOL" in value:
+            key_record[attr] = value["BOOL"]
+        elif "NULL" in value:
+            key_record[attr] = None
+        else:
+            key_record[attr] = TypeDeserializer().deserialize(value)
+    return key_record
+
+
 def verify_api_key(api_key: str) -> Optional[Dict[str, Any]]:
     """Verify an API key and return the key record if valid"""
-    key_hash = hash_api_key(api_key)
+    # Every issued key carries the prefix, so anything else can't match a
+    # stored hash - reject it without a GSI round trip
+    if not api_key.startswith(API_KEY_PREFIX):
+        return None
 
-    # Query the key_hash-index GSI
-    api_keys_table = dynamodb.Table(API_KEYS_TABLE)
+    key_hash = hash_api_key(api_key)
 
     try:
-        response = api_keys_table.query(
-            IndexName="key_hash-index",
-            KeyConditionExpression="key_hash = :kh",
-            ExpressionAttributeValues={":kh": key_hash}
-        )
+        key_record = get_cached_key_record(key_hash)
+        if key_record is None:
+            # Query the key_hash-index GSI
+            response = auth_dynamodb_client.query(
+                TableName=API_KEYS_TABLE,
+                IndexName="key_hash-index",
+                KeyConditionExpression="key_hash = :kh",
+                ExpressionAttributeValues={":kh": {"S": key_hash}},
+                **API_KEY_AUTH_PROJECTION
+            )
 
-        items = response.get("Items", [])
-        if not items:
-            return None
+            items = response.get("Items", [])
+            if not items:
+                return None
 
-        key_record = items[0]
+            key_record = key_record_from_item(items[0])
+            cache_key_record(key_hash, key_record)
 
         # Check if active
         if not key_record.get("is_active", False):
@@ -258,35 +612,123 @@ def verify_api_key(api_key: str) -> Optional[Dict[str, Any]]:
             if expires_at and expires_at < datetime.now(timezone.utc):
                 return None
 
-        # Update last used timestamp
+        return key_record
+
+    except ClientError as e:
+        print(f"Error verifying API key: {e}")
+        return None
+
+
+def update_last_used(key_record: Dict[str, Any]) -> None:
+    """Record when a key was last used, writing at most once per LAST_USED_INTERVAL"""
+    now = datetime.now(timezone.utc)
+    now_str = now.isoformat()
+    threshold = (now - LAST_USED_INTERVAL).isoformat()
+
+    # The record was just read, so skip the write if it is already recent
+    last_used_at = key_record.get("last_used_at")
+    if last_used_at and last_used_at >= threshold:
+        return
+
+    try:
         api_keys_table.update_item(
             Key={
                 "app_id": key_record["app_id"],
                 "id": key_record["id"]
             },
             UpdateExpression="SET last_used_at = :lut",
+            ConditionExpression="attribute_not_exists(last_used_at) OR last_used_at = :null OR last_used_at < :threshold",
             ExpressionAttributeValues={
-                ":lut": datetime_to_str(datetime.now(timezone.utc))
+                ":lut": now_str,
+                ":null": None,
+                ":threshold": threshold
             }
         )
+    except ClientError as e:
+        # Another request already recorded a recent use
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            print(f"Error updating API key last_used_at: {e}")
+            return
+
+    # Keep a cached copy of the record from re-triggering the write
+    key_record["last_used_at"] = now_str
 
-        return key_record
 
+def put_api_key_if_app_exists(app_id: str, item: Dict[str, Any]) -> bool:
+    """Store an API key in one transaction with a check that its app exists,
+    returning False if it does not"""
+    serializer = TypeSerializer()
+    try:
+        dynamodb_client.transact_write_items(
+            TransactItems=[
+                {
+                    "ConditionCheck": {
+                        "TableName": APPLICATIONS_TABLE,
+                        "Key": {"id": {"S": app_id}},
+                        "ConditionExpression": "attribute_exists(id)"
+                    }
+                },
+                {
+                    "Put": {
+                        "TableName": API_KEYS_TABLE,
+                        "Item": {k: serializer.serialize(v) for k, v in item.items()}
+                    }
+                }
+            ]
+        )
     except ClientError as e:
-        print(f"Error verifying API key: {e}")
-        return None
+        if e.response["Error"]["Code"] != "TransactionCanceledException":
+            raise
+        reasons = e.response.get("CancellationReasons", [])
+        if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+            return False
+        raise
+    return True
+
+
+def delete_app_item(app_id: str) -> bool:
+    """Delete an application, returning False if it does not exist"""
+    try:
+        applications_table.delete_item(
+            Key={"id": app_id},
+            ConditionExpression="attribute_exists(id)"
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+    return True
+
+
+def delete_app_api_keys(api_keys_table, app_id: str) -> None:
+    """Delete every API key of an application, 25 per BatchWriteItem call"""
+    query_kwargs = {
+        "KeyConditionExpression": "app_id = :aid",
+        "ExpressionAttributeValues": {":aid": app_id},
+        "ProjectionExpression": "id"
+    }
+    with api_keys_table.batch_writer() as batch:
+        while True:
+            keys_response = api_keys_table.query(**query_kwargs)
+            for key in keys_response.get("Items", []):
+                batch.delete_item(Key={"app_id": app_id, "id": key["id"]})
+            if "LastEvaluatedKey" not in keys_response:
+                break
+            query_kwargs["ExclusiveStartKey"] = keys_response["LastEvaluatedKey"]
 
 
 # Dependency for API key authentication
-async def require_api_key(x_api_key: Optional[str] = Header(None)):
+async def require_api_key(background_tasks: BackgroundTasks, x_api_key: Optional[str] = Header(None)):
     """Dependency to require valid API key"""
     if not x_api_key:
         raise HTTPException(status_code=401, detail="API key required")
 
-    key_record = verify_api_key(x_api_key)
+    key_record = await asyncio.to_thread(verify_api_key, x_api_key)
     if not key_record:
         raise HTTPException(status_code=401, detail="Invalid or expired API key")
 
+    # Track usage after the response is sent
+    background_tasks.add_task(update_last_used, key_record)
     return key_record
 
 
@@ -319,11 +761,10 @@ async def health_check():
 async def create_application(app_data: ApplicationCreate):
     """Create a new application"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-
         # Generate unique ID
         app_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc)
+        now_str = now.isoformat()
 
         item = {
             "id": app_id,
@@ -331,11 +772,11 @@ async def create_application(app_data: ApplicationCreate):
             "application_id": app_data.Application,
             "email": app_data.Email,
             "domain": app_data.Domain,
-            "created_at": datetime_to_str(now),
-            "updated_at": datetime_to_str(now)
+            "created_at": now_str,
+            "updated_at": now_str
         }
 
-        applications_table.put_item(Item=item)
+        await asyncio.to_thread(applications_table.put_item, Item=item)
 
         # Return response
         return ApplicationResponse(
@@ -352,24 +793,24 @@ async def create_application(app_data: ApplicationCreate):
 
 
 @app.get("/apps", response_model=List[ApplicationResponse])
-async def list_applications(skip: int = 0, limit: int = 100):
-    print(f"[DEBUG] Received GET /apps with skip={skip}, limit={limit}")
-
+async def list_applications(response: Response, limit: int = Query(100, ge=1, le=1000), cursor: Optional[str] = None):
+    """List applications one page at a time; pass X-Next-Cursor back as cursor for the next page"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-
-        # Scan the table (for production, consider using pagination)
-        response = applications_table.scan()
-        items = response.get("Items", [])
+        start_key = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-        # Handle pagination if there are more items
-        while "LastEvaluatedKey" in response:
-            response = applications_table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-            items.extend(response.get("Items", []))
+    try:
+        # Read a single page; DynamoDB stops after `limit` items
+        scan_kwargs = {"Limit": limit, **APP_LIST_PROJECTION}
+        if start_key:
+            scan_kwargs["ExclusiveStartKey"] = start_key
+        scan_response = await asyncio.to_thread(applications_table.scan, **scan_kwargs)
+        items = scan_response.get("Items", [])
 
         # Convert to response models
         apps = []
-        for item in items[skip:skip+limit]:
+        for item in items:
             apps.append(ApplicationResponse(
                 id=item["id"],
                 name=item["name"],
@@ -380,7 +821,9 @@ async def list_applications(skip: int = 0, limit: int = 100):
                 updated_at=str_to_datetime(item["updated_at"])
             ))
 
-        print(f"[DEBUG] Returning {len(apps)} applications")
+        if "LastEvaluatedKey" in scan_response:
+            response.headers["X-Next-Cursor"] = encode_cursor(scan_response["LastEvaluatedKey"])
+
         return apps
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list applications: {str(e)}")
@@ -390,9 +833,7 @@ async def list_applications(skip: int = 0, limit: int = 100):
 async def get_application(app_id: str):
     """Get a specific application"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-
-        response = applications_table.get_item(Key={"id": app_id})
+        response = await asyncio.to_thread(applications_table.get_item, Key={"id": app_id})
         item = response.get("Item")
 
         if not item:
@@ -417,40 +858,41 @@ async def get_application(app_id: str):
 async def update_application(app_id: str, app_data: ApplicationCreate):
     """Update an existing application"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-
-        # Check if application exists
-        response = applications_table.get_item(Key={"id": app_id})
-        if "Item" not in response:
-            raise HTTPException(status_code=404, detail="Application not found")
-
-        # Update the application
+        # Single conditional write: checks existence, updates and returns the item
         now = datetime.now(timezone.utc)
-        
-        applications_table.update_item(
-            Key={"id": app_id},
-            UpdateExpression="SET #name = :name, application_id = :app_id, email = :email, domain = :domain, updated_at = :updated_at",
-            ExpressionAttributeNames={
-                "#name": "name"  # 'name' is a reserved word in DynamoDB
-            },
-            ExpressionAttributeValues={
-                ":name": app_data.App_name,
-                ":app_id": app_data.Application,
-                ":email": app_data.Email,
-                ":domain": app_data.Domain,
-                ":updated_at": datetime_to_str(now)
-            }
-        )
+        try:
+            response = await asyncio.to_thread(
+                applications_table.update_item,
+                Key={"id": app_id},
+                UpdateExpression="SET #name = :name, application_id = :app_id, email = :email, #domain = :domain, updated_at = :updated_at",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeNames={
+                    "#name": "name",  # 'name' and 'domain' are reserved words in DynamoDB
+                    "#domain": "domain"
+                },
+                ExpressionAttributeValues={
+                    ":name": app_data.App_name,
+                    ":app_id": app_data.Application,
+                    ":email": app_data.Email,
+                    ":domain": app_data.Domain,
+                    ":updated_at": now.isoformat()
+                },
+                ReturnValues="ALL_NEW"
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise HTTPException(status_code=404, detail="Application not found")
+            raise
 
-        # Return updated application
+        item = response["Attributes"]
         return ApplicationResponse(
-            id=app_id,
-            name=app_data.App_name,
-            application_id=app_data.Application,
-            email=app_data.Email,
-            domain=app_data.Domain,
-            created_at=str_to_datetime(response["Item"]["created_at"]),
-            updated_at=now
+            id=item["id"],
+            name=item["name"],
+            application_id=item["application_id"],
+            email=item["email"],
+            domain=item["domain"],
+            created_at=str_to_datetime(item["created_at"]),
+            updated_at=str_to_datetime(item["updated_at"])
         )
     except HTTPException:
         raise
@@ -462,27 +904,16 @@ async def update_application(app_id: str, app_data: ApplicationCreate):
 async def delete_application(app_id: str):
     """Delete an application and all its API keys"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-        api_keys_table = dynamodb.Table(API_KEYS_TABLE)
-
-        # Check if application exists
-        response = applications_table.get_item(Key={"id": app_id})
-        if "Item" not in response:
-            raise HTTPException(status_code=404, detail="Application not found")
-
-        # Delete all API keys for this application
-        keys_response = api_keys_table.query(
-            KeyConditionExpression="app_id = :aid",
-            ExpressionAttributeValues={":aid": app_id}
+        # Delete the application (failing if it does not exist) and its API
+        # keys concurrently; keys of a missing app are orphans either way
+        app_deleted, _ = await asyncio.gather(
+            asyncio.to_thread(delete_app_item, app_id),
+            asyncio.to_thread(delete_app_api_keys, api_keys_table, app_id)
         )
+        invalidate_cached_keys(app_id)
 
-        for key in keys_response.get("Items", []):
-            api_keys_table.delete_item(
-                Key={"app_id": app_id, "id": key["id"]}
-            )
-
-        # Delete the application
-        applications_table.delete_item(Key={"id": app_id})
+        if not app_deleted:
+            raise HTTPException(status_code=404, detail="Application not found")
 
         return None
     except HTTPException:
@@ -498,17 +929,18 @@ async def generate_api_key(
 ):
     """Generate a new API key for an application"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-        api_keys_table = dynamodb.Table(API_KEYS_TABLE)
-
-        # Verify application exists
-        app_response = applications_table.get_item(Key={"id": app_id})
-        app = app_response.get("Item")
-        if not app:
-            raise HTTPException(status_code=404, detail="Application not found")
+        # The app is only read when its name is needed for the default key name;
+        # otherwise the write itself checks that the app exists
+        key_name = key_data.name
+        if not key_name:
+            app_response = await asyncio.to_thread(applications_table.get_item, Key={"id": app_id})
+            app = app_response.get("Item")
+            if not app:
+                raise HTTPException(status_code=404, detail="Application not found")
+            key_name = f"API Key for {app['name']}"
 
         # Generate a secure random API key
-        api_key = f"sk_{secrets.token_urlsafe(32)}"
+        api_key = f"{API_KEY_PREFIX}{secrets.token_urlsafe(32)}"
         key_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc)
 
@@ -517,14 +949,18 @@ async def generate_api_key(
             "app_id": app_id,
             "id": key_id,
             "key_hash": hash_api_key(api_key),
-            "name": key_data.name or f"API Key for {app['name']}",
-            "created_at": datetime_to_str(now),
+            "name": key_name,
+            "created_at": now.isoformat(),
             "expires_at": datetime_to_str(key_data.expires_at) if key_data.expires_at else None,
             "last_used_at": None,
             "is_active": True
         }
 
-        api_keys_table.put_item(Item=item)
+        if key_data.name:
+            if not await asyncio.to_thread(put_api_key_if_app_exists, app_id, item):
+                raise HTTPException(status_code=404, detail="Application not found")
+        else:
+            await asyncio.to_thread(api_keys_table.put_item, Item=item)
 
         # Return the plain key (only time it's shown)
         return APIKeyResponse(
@@ -544,18 +980,17 @@ async def generate_api_key(
 async def list_api_keys(app_id: str):
     """List all API keys for an application (without showing the actual keys)"""
     try:
-        applications_table = dynamodb.Table(APPLICATIONS_TABLE)
-        api_keys_table = dynamodb.Table(API_KEYS_TABLE)
-
         # Check if application exists
-        app_response = applications_table.get_item(Key={"id": app_id})
+        app_response = await asyncio.to_thread(applications_table.get_item, Key={"id": app_id})
         if "Item" not in app_response:
             raise HTTPException(status_code=404, detail="Application not found")
 
         # Query all API keys for this application
-        response = api_keys_table.query(
+        response = await asyncio.to_thread(
+            api_keys_table.query,
             KeyConditionExpression="app_id = :aid",
-            ExpressionAttributeValues={":aid": app_id}
+            ExpressionAttributeValues={":aid": app_id},
+            **API_KEY_LIST_PROJECTION
         )
 
         keys = []
@@ -580,22 +1015,20 @@ async def list_api_keys(app_id: str):
 async def revoke_api_key(app_id: str, key_id: str):
     """Revoke (deactivate) an API key"""
     try:
-        api_keys_table = dynamodb.Table(API_KEYS_TABLE)
-
-        # Get the key to verify it exists
-        response = api_keys_table.get_item(
-            Key={"app_id": app_id, "id": key_id}
-        )
-
-        if "Item" not in response:
-            raise HTTPException(status_code=404, detail="API key not found")
-
-        # Update is_active to False
-        api_keys_table.update_item(
-            Key={"app_id": app_id, "id": key_id},
-            UpdateExpression="SET is_active = :ia",
-            ExpressionAttributeValues={":ia": False}
-        )
+        # Update is_active to False, failing if the key does not exist
+        try:
+            await asyncio.to_thread(
+                api_keys_table.update_item,
+                Key={"app_id": app_id, "id": key_id},
+                UpdateExpression="SET is_active = :ia",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeValues={":ia": False}
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise HTTPException(status_code=404, detail="API key not found")
+            raise
+        invalidate_cached_keys(app_id, key_id)
 
         return None
     except HTTPException:
@@ -615,12 +1048,14 @@ async def protected_route(key_record: Dict[str, Any] = Depends(require_api_key))
 
 
 @app.post("/verify-key")
-async def verify_key(x_api_key: str = Header(...)):
+async def verify_key(background_tasks: BackgroundTasks, x_api_key: str = Header(...)):
     """Verify if an API key is valid"""
-    key_record = verify_api_key(x_api_key)
+    key_record = await asyncio.to_thread(verify_api_key, x_api_key)
     if not key_record:
         raise HTTPException(status_code=401, detail="Invalid or expired API key")
 
+    background_tasks.add_task(update_last_used, key_record)
+
     return {
         "valid": True,
         "app_id": key_record["app_id"],
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 """Check moto imports to see what's available."""
+import importlib
+import importlib.util
 
 try:
     import moto
@@ -7,20 +9,27 @@ try:
     print("Available in moto module:")
     print([attr for attr in dir(moto) if 'mock' in attr.lower()])
     
-    # Try different import patterns
+    # Try different import patterns as (module, name) pairs
     patterns = [
-        "from moto import mock_dynamodb",
-        "from moto.mock_dynamodb import mock_dynamodb", 
-        "from moto.dynamodb import mock_dynamodb",
-        "from moto import mock_aws",
+        ("moto", "mock_dynamodb"),
+        ("moto.mock_dynamodb", "mock_dynamodb"),
+        ("moto.dynamodb", "mock_dynamodb"),
+        ("moto", "mock_aws"),
     ]
     
-    for pattern in patterns:
+    for module_name, name in patterns:
+        pattern = f"from {module_name} import {name}"
         try:
-            exec(pattern)
+            # find_spec raises ModuleNotFoundError if a parent package is missing
+            spec = importlib.util.find_spec(module_name)
+        except ModuleNotFoundError:
+            spec = None
+        if spec is None:
+            print(f"❌ {pattern} - No module named '{module_name}'")
+        elif hasattr(importlib.import_module(module_name), name):
             print(f"✅ {pattern}")
-        except ImportError as e:
-            print(f"❌ {pattern} - {e}")
+        else:
+            print(f"❌ {pattern} - cannot import name '{name}'")
             
 except ImportError as e:
     print(f"Moto not installed: {e}")
\ No newline at end of file
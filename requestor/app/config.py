@@ -9,6 +9,9 @@ class Settings:
     """Application settings loaded from environment variables."""
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
     SQS_QUEUE_URL: Optional[str] = os.getenv("SQS_QUEUE_URL")
+    # How long /notifications waits to coalesce concurrent messages into one
+    # SendMessageBatch call; 0 sends each message on its own
+    SQS_BATCH_WINDOW_MS: float = float(os.getenv("SQS_BATCH_WINDOW_MS", "10"))
     
     def __post_init__(self) -> None:
         """Validate required environment variables."""
@@ -1,15 +1,17 @@
 """Main FastAPI application for requestor service."""
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
 from .models import NotificationRequest
-from .sqs_client import send_message_to_queue
+from .config import settings
+from .sqs_client import MessageBatcher, run_in_sender, send_message_to_queue
 import logging
 import boto3
 import os
 import time
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -31,6 +33,9 @@ class AppState:
 
 app_state = AppState()
 
+# Coalesces concurrent /notifications sends into SQS batch calls
+batcher = MessageBatcher(window=settings.SQS_BATCH_WINDOW_MS / 1000)
+
 @app.on_event("startup")
 async def startup_event() -> None:
     """Initialize application on startup."""
@@ -55,9 +60,17 @@ async def startup_event() -> None:
         logging.error(f"❌ SQS connectivity failed in {sqs_time:.3f}s: {e}")
         app_state.ready = False
     
+    if settings.SQS_BATCH_WINDOW_MS > 0:
+        batcher.start()
+    
     total_startup = time.time() - startup_start
     logging.info(f"🎯 Startup completed in {total_startup:.3f}s")
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """Send any notifications still waiting in the batcher."""
+    await batcher.stop()
+
 @app.get("/health")
 def health_check() -> Dict[str, Any]:
     """Health check endpoint."""
@@ -83,7 +96,7 @@ def authenticate(request_data: dict) -> Dict[str, Any]:
     }
 
 @app.post("/notifications")
-def notify(req: NotificationRequest) -> Dict[str, Any]:
+async def notify(req: NotificationRequest) -> Dict[str, Any]:
     """Send notification request to SQS queue. JWT validation handled by API Gateway."""
     request_start = time.time()
     logging.info(f"📨 Processing notification request...")
@@ -91,13 +104,16 @@ def notify(req: NotificationRequest) -> Dict[str, Any]:
     try:
         # Time Pydantic validation
         validation_start = time.time()
-        request_dict = req.dict()
+        request_dict = req.model_dump()
         validation_time = time.time() - validation_start
         logging.info(f"✅ Pydantic validation completed in {validation_time:.3f}s")
         
         # Time SQS operation
         sqs_start = time.time()
-        response = send_message_to_queue(request_dict)
+        if batcher.running:
+            response = await batcher.submit(request_dict)
+        else:
+            response = await run_in_sender(send_message_to_queue, request_dict)
         sqs_time = time.time() - sqs_start
         logging.info(f"✅ SQS message sent in {sqs_time:.3f}s")
         
@@ -1,5 +1,5 @@
 """Pydantic models for notification requests."""
-from pydantic import BaseModel, Field, validator, root_validator, EmailStr
+from pydantic import BaseModel, Field, field_validator, model_validator, EmailStr
 from typing import Optional, List, Any
 
 class IntervalModel(BaseModel):
@@ -10,31 +10,35 @@ class IntervalModel(BaseModel):
     Months: Optional[List[int]] = []
     Years: Optional[List[int]] = []
 
-    @validator("Days", each_item=True)
-    def validate_day(cls, v: int) -> int:
+    @field_validator("Days")
+    @classmethod
+    def validate_day(cls, v: Optional[List[int]]) -> Optional[List[int]]:
         """Validate day values."""
-        if not 1 <= v <= 31:
+        if v and any(not 1 <= item <= 31 for item in v):
             raise ValueError("Days must be between 1 and 31")
         return v
 
-    @validator("Weeks", each_item=True)
-    def validate_week(cls, v: int) -> int:
+    @field_validator("Weeks")
+    @classmethod
+    def validate_week(cls, v: Optional[List[int]]) -> Optional[List[int]]:
         """Validate week values."""
-        if not 1 <= v <= 52:
+        if v and any(not 1 <= item <= 52 for item in v):
             raise ValueError("Weeks must be between 1 and 52")
         return v
 
-    @validator("Months", each_item=True)
-    def validate_month(cls, v: int) -> int:
+    @field_validator("Months")
+    @classmethod
+    def validate_month(cls, v: Optional[List[int]]) -> Optional[List[int]]:
         """Validate month values."""
-        if not 1 <= v <= 12:
+        if v and any(not 1 <= item <= 12 for item in v):
             raise ValueError("Months must be between 1 and 12")
         return v
 
-    @validator("Years", each_item=True)
-    def validate_year(cls, v: int) -> int:
+    @field_validator("Years")
+    @classmethod
+    def validate_year(cls, v: Optional[List[int]]) -> Optional[List[int]]:
         """Validate year values."""
-        if v < 1970 or v > 2100:
+        if v and any(item < 1970 or item > 2100 for item in v):
             raise ValueError("Years must be between 1970 and 2100")
         return v
 
@@ -53,20 +57,16 @@ class NotificationRequest(BaseModel):
     EmailAddresses: Optional[List[EmailStr]] = None
     PushToken: Optional[str] = None
 
-    @root_validator(skip_on_failure=True)
-    def validate_delivery_target(cls, values: dict) -> dict:
+    @model_validator(mode="after")
+    def validate_delivery_target(self) -> "NotificationRequest":
         """Validate that required delivery targets are provided based on output type."""
-        output_type = values.get("OutputType")
-        phone = values.get("PhoneNumber")
-        emails = values.get("EmailAddresses")
-        token = values.get("PushToken")
+        output_type = self.OutputType
 
-        if output_type == "SMS" and not phone:
+        if output_type == "SMS" and not self.PhoneNumber:
             raise ValueError("PhoneNumber is required for SMS notifications")
-        if output_type == "EMAIL" and not emails:
+        if output_type == "EMAIL" and not self.EmailAddresses:
             raise ValueError("EmailAddresses is required for EMAIL notifications")
-        if output_type == "PUSH" and not token:
+        if output_type == "PUSH" and not self.PushToken:
             raise ValueError("PushToken is required for PUSH notifications")
 
-        return values
-
+        return self
@@ -1,47 +1,192 @@
 """SQS client operations for requestor service."""
+import asyncio
+import logging
+import time
 import boto3
-import json
-from typing import Dict, Any
+import orjson
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+def dumps(obj: Any) -> str:
+    """Serialize to a JSON string with orjson."""
+    return orjson.dumps(obj).decode()
+
+# SendMessageBatch accepts at most 10 entries per call
+SQS_BATCH_LIMIT = 10
+
+# One sender thread per pooled connection, so sends never queue behind
+# asyncio's default executor (min(32, cpus + 4) threads)
+SQS_MAX_CONNECTIONS = 50
+_executor = ThreadPoolExecutor(max_workers=SQS_MAX_CONNECTIONS, thread_name_prefix="sqs-send")
+
+@lru_cache(maxsize=None)
 def get_sqs_client() -> Any:
-    """Get SQS client."""
+    """Get the process-wide SQS client.
+
+    botocore clients are thread-safe, so one pooled, keep-alive client is
+    shared by every request instead of rebuilding it (and its TLS
+    connection) per message.
+    """
     return boto3.client(
         "sqs",
-        region_name=settings.AWS_REGION
+        region_name=settings.AWS_REGION,
+        config=Config(
+            max_pool_connections=SQS_MAX_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+            tcp_keepalive=True
+        )
     )
 
+async def run_in_sender(func: Any, *args: Any) -> Any:
+    """Run a blocking SQS call on the sender pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
 def send_message_to_queue(message: Dict[str, Any]) -> Dict[str, Any]:
     """Send message to SQS queue."""
-    import logging
-    import time
-    
     if not message or not isinstance(message, dict):
         raise ValueError("message must be a non-empty dictionary")
     
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        send_start = time.perf_counter()
     try:
-        # Time SQS client creation
-        client_start = time.time()
-        sqs = get_sqs_client()
-        client_time = time.time() - client_start
-        logging.info(f"🔧 SQS client created in {client_time:.3f}s")
-        
-        # Time JSON serialization
-        json_start = time.time()
-        message_body = json.dumps(message)
-        json_time = time.time() - json_start
-        logging.info(f"📝 JSON serialization completed in {json_time:.3f}s")
-        
-        # Time SQS send operation
-        send_start = time.time()
-        response = sqs.send_message(
+        response = get_sqs_client().send_message(
             QueueUrl=settings.SQS_QUEUE_URL,
-            MessageBody=message_body
+            MessageBody=dumps(message)
         )
-        send_time = time.time() - send_start
-        logging.info(f"📤 SQS send_message completed in {send_time:.3f}s")
-        
+        if debug:
+            logger.debug("📤 SQS send_message completed in %.3fs", time.perf_counter() - send_start)
         return response
     except Exception as e:
-        logging.error(f"❌ SQS operation failed: {str(e)}")
+        logger.error("❌ SQS operation failed: %s", e)
         raise RuntimeError(f"Failed to send message to SQS: {str(e)}")
+
+def send_messages_to_queue(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Send messages to SQS queue with SendMessageBatch, 10 per call.
+
+    Returns one result per message, in order: the batch's Successful entry
+    (with MessageId) or its Failed entry (with Code and Message).
+    """
+    if not messages or not all(message and isinstance(message, dict) for message in messages):
+        raise ValueError("messages must be a non-empty list of non-empty dictionaries")
+
+    try:
+        sqs = get_sqs_client()
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(messages), SQS_BATCH_LIMIT):
+            chunk = messages[start:start + SQS_BATCH_LIMIT]
+            response = sqs.send_message_batch(
+                QueueUrl=settings.SQS_QUEUE_URL,
+                Entries=[
+                    {"Id": str(i), "MessageBody": dumps(message)}
+                    for i, message in enumerate(chunk)
+                ]
+            )
+            by_id = {entry["Id"]: entry for entry in response.get("Successful", [])}
+            by_id.update((entry["Id"], entry) for entry in response.get("Failed", []))
+            results.extend(by_id[str(i)] for i in range(len(chunk)))
+        return results
+    except Exception as e:
+        logger.error("❌ SQS batch operation failed: %s", e)
+        raise RuntimeError(f"Failed to send messages to SQS: {str(e)}")
+
+class MessageBatcher:
+    """Coalesce concurrent sends into SendMessageBatch calls.
+
+    Messages submitted within `window` seconds of the first one in a batch
+    (up to 10) are sent together; a message that arrives alone is sent with
+    plain SendMessage.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.queue: Optional[asyncio.Queue] = None
+        self.collector: Optional[asyncio.Task] = None
+        self.flushes: set = set()
+
+    @property
+    def running(self) -> bool:
+        """Whether submitted messages are being collected."""
+        return self.collector is not None
+
+    def start(self) -> None:
+        """Start collecting messages on the running event loop."""
+        self.queue = asyncio.Queue()
+        self.collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        """Stop collecting, then send anything still queued or in flight."""
+        if self.collector is None:
+            return
+        collector, self.collector = self.collector, None
+        collector.cancel()
+        # Let the collector hand its partial batch to _schedule_flush first
+        await asyncio.gather(collector, return_exceptions=True)
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for start in range(0, len(pending), SQS_BATCH_LIMIT):
+            self._schedule_flush(pending[start:start + SQS_BATCH_LIMIT])
+        if self.flushes:
+            await asyncio.gather(*self.flushes, return_exceptions=True)
+
+    async def submit(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a message and wait for its SendMessage-style response."""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((message, future))
+        return await future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                deadline = loop.time() + self.window
+                while len(batch) < SQS_BATCH_LIMIT:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # Flush in the background so the next batch collects meanwhile
+                self._schedule_flush(batch)
+                batch = []
+        finally:
+            # Cancelled by stop(): send what was already taken off the queue
+            if batch:
+                self._schedule_flush(batch)
+
+    def _schedule_flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        task = asyncio.create_task(self._flush(batch))
+        self.flushes.add(task)
+        task.add_done_callback(self.flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [await run_in_sender(send_message_to_queue, batch[0][0])]
+            else:
+                results = await run_in_sender(send_messages_to_queue, [message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if "MessageId" in result:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(
+                    f"Failed to send message to SQS: {result.get('Code')}: {result.get('Message')}"
+                ))
@@ -0,0 +1,137 @@
+"""Unit tests for the admin app package (admin/app)."""
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+@pytest.fixture
+def app_client():
+    """Test client for admin/app/main.py."""
+    from admin.app.main import app
+    return TestClient(app)
+
+@pytest.mark.unit
+@patch('admin.app.main.get_app_by_id')
+def test_database_throttled_returns_429(mock_get_app, app_client):
+    """Test that DynamoDB throttling surfaces as 429 rather than 500."""
+    from admin.app.db import DatabaseThrottledError
+
+    mock_get_app.side_effect = DatabaseThrottledError("Failed to retrieve application: throttled")
+
+    response = app_client.get("/app/busy-app")
+    assert response.status_code == 429
+    assert response.json()["detail"].startswith("Database is busy, retry later")
+
+@pytest.mark.unit
+@patch('admin.app.main.count_apps')
+@patch('admin.app.main.scan_apps_page')
+def test_list_applications_cursor(mock_scan_page, mock_count, app_client):
+    """Test cursor paging of /apps and that the total count is opt-in."""
+    mock_scan_page.return_value = ([], {"Application": "last.app"})
+
+    response = app_client.get("/apps", params={"limit": 10})
+    assert response.status_code == 200
+    mock_scan_page.assert_called_once_with(10, None)
+    mock_count.assert_not_called()
+    assert "X-Total-Count" not in response.headers
+    cursor = response.headers["X-Next-Cursor"]
+
+    mock_scan_page.reset_mock()
+    mock_scan_page.return_value = ([], None)
+    mock_count.return_value = 3
+    response = app_client.get("/apps", params={"limit": 10, "cursor": cursor, "include_total": "true"})
+    assert response.status_code == 200
+    mock_scan_page.assert_called_once_with(10, {"Application": "last.app"})
+    assert response.headers["X-Total-Count"] == "3"
+    assert "X-Next-Cursor" not in response.headers
+
+@pytest.mark.unit
+@pytest.mark.parametrize("start_key", [
+    {"Application": "last.app", "extra": "x"},
+    {"Application": 7},
+    {"Application": ""},
+    ["last.app"],
+])
+@patch('admin.app.main.scan_apps_page')
+def test_list_applications_rejects_bad_cursor(mock_scan_page, start_key, app_client):
+    """Test that malformed or tampered cursors are a 400 and never reach DynamoDB."""
+    from admin.app.main import _encode_cursor
+
+    assert app_client.get("/apps", params={"cursor": _encode_cursor(start_key)}).status_code == 400
+    assert app_client.get("/apps", params={"cursor": "not-a-cursor"}).status_code == 400
+    mock_scan_page.assert_not_called()
+
+@pytest.mark.unit
+def test_ttl_cache_single_flight():
+    """Test that concurrent misses share one call and the result is cached afterwards."""
+    import threading
+    from admin.app.cache import ttl_cache
+
+    calls = []
+    release = threading.Event()
+
+    @ttl_cache(ttl=60)
+    def lookup(key):
+        calls.append(key)
+        release.wait(1)
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(lookup("a"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["A"] * 5
+    assert lookup("a") == "A"
+    assert calls == ["a"]
+
+    lookup.cache_invalidate("a")
+    assert lookup("a") == "A"
+    assert calls == ["a", "a"]
+
+@pytest.mark.unit
+def test_ttl_cache_invalidate_during_read():
+    """Test that a read in flight during a write is neither cached nor joined."""
+    import threading
+    from admin.app.cache import ttl_cache
+
+    store = {"a": "old", "b": "old"}
+    started = threading.Event()
+    release = threading.Event()
+
+    @ttl_cache(ttl=60)
+    def lookup(key):
+        value = store[key]
+        if key == "a" and not release.is_set():
+            started.set()
+            release.wait(1)
+        return value
+
+    for invalidate in (lambda: lookup.cache_clear(), lambda: lookup.cache_invalidate("a")):
+        release.clear()
+        started.clear()
+        store["a"] = "old"
+        reader = threading.Thread(target=lookup, args=("a",))
+        reader.start()
+        started.wait(1)
+        store["a"] = "new"
+        invalidate()
+        release.set()
+        assert lookup("a") == "new"
+        reader.join()
+        assert lookup("a") == "new"
+        lookup.cache_clear()
+
+    # Invalidating one key does not stop an in-flight read of another from being cached
+    release.clear()
+    started.clear()
+    reader = threading.Thread(target=lookup, args=("a",))
+    reader.start()
+    started.wait(1)
+    lookup.cache_invalidate("b")
+    release.set()
+    reader.join()
+    store["a"] = "newer"
+    assert lookup("a") == "new"
@@ -1,12 +1,7 @@
 """Unit tests for Admin service."""
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
-import sys
-import os
-
-# Add admin directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../admin'))
+from unittest.mock import patch
 
 # Using shared client fixture from conftest.py
 
@@ -29,13 +24,9 @@ def test_root_endpoint(client):
     assert "cors_origins" in data
 
 @pytest.mark.unit
-@patch('admin.server.dynamodb')
-def test_create_application(mock_dynamodb, client, sample_application):
+@patch('admin.server.applications_table')
+def test_create_application(mock_table, client, sample_application):
     """Test application creation."""
-    # Mock DynamoDB table
-    mock_table = MagicMock()
-    mock_dynamodb.Table.return_value = mock_table
-    
     response = client.post("/app", json=sample_application)
     assert response.status_code == 201
     
@@ -48,11 +39,10 @@ def test_create_application(mock_dynamodb, client, sample_application):
     mock_table.put_item.assert_called_once()
 
 @pytest.mark.unit
-@patch('admin.server.dynamodb')
-def test_list_applications(mock_dynamodb, client):
+@patch('admin.server.applications_table')
+def test_list_applications(mock_table, client):
     """Test listing applications."""
     # Mock DynamoDB response
-    mock_table = MagicMock()
     mock_table.scan.return_value = {
         "Items": [{
             "id": "test-id",
@@ -64,7 +54,6 @@ def test_list_applications(mock_dynamodb, client):
             "updated_at": "2024-01-01T00:00:00+00:00"
         }]
     }
-    mock_dynamodb.Table.return_value = mock_table
     
     response = client.get("/apps")
     assert response.status_code == 200
@@ -74,24 +63,38 @@ def test_list_applications(mock_dynamodb, client):
     assert data[0]["name"] == "Test App"
 
 @pytest.mark.unit
-@patch('admin.server.dynamodb')
-def test_generate_api_key(mock_dynamodb, client):
+@patch('admin.server.applications_table')
+def test_list_applications_cursor(mock_table, client):
+    """Test that list pagination is pushed down to DynamoDB via a cursor."""
+    mock_table.scan.return_value = {"Items": [], "LastEvaluatedKey": {"id": "last-id"}}
+
+    response = client.get("/apps", params={"limit": 10})
+    assert response.status_code == 200
+    mock_table.scan.assert_called_once()
+    assert mock_table.scan.call_args.kwargs["Limit"] == 10
+    assert "ExclusiveStartKey" not in mock_table.scan.call_args.kwargs
+    assert "#a1" in mock_table.scan.call_args.kwargs["ProjectionExpression"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    mock_table.scan.reset_mock()
+    mock_table.scan.return_value = {"Items": []}
+    response = client.get("/apps", params={"limit": 10, "cursor": cursor})
+    assert response.status_code == 200
+    mock_table.scan.assert_called_once()
+    assert mock_table.scan.call_args.kwargs["ExclusiveStartKey"] == {"id": "last-id"}
+    assert "X-Next-Cursor" not in response.headers
+
+    assert client.get("/apps", params={"cursor": "not-a-cursor"}).status_code == 400
+    # Extra keys or a non-string id would otherwise reach DynamoDB and fail with 500
+    from admin.server import encode_cursor
+    assert client.get("/apps", params={"cursor": encode_cursor({"id": "x", "extra": "y"})}).status_code == 400
+    assert client.get("/apps", params={"cursor": encode_cursor({"id": 7})}).status_code == 400
+
+@pytest.mark.unit
+@patch('admin.server.dynamodb_client')
+@patch('admin.server.applications_table')
+def test_generate_api_key(mock_apps_table, mock_client, client):
     """Test API key generation."""
-    # Mock application exists
-    mock_apps_table = MagicMock()
-    mock_apps_table.get_item.return_value = {
-        "Item": {"id": "test-app", "name": "Test App"}
-    }
-    
-    mock_keys_table = MagicMock()
-    
-    def table_side_effect(table_name):
-        if "applications" in table_name:
-            return mock_apps_table
-        return mock_keys_table
-    
-    mock_dynamodb.Table.side_effect = table_side_effect
-    
     response = client.post("/app/test-app/api-key", json={"name": "Test Key"})
     assert response.status_code == 201
     
@@ -100,28 +103,22 @@ def test_generate_api_key(mock_dynamodb, client):
     assert data["api_key"].startswith("sk_")
     assert data["name"] == "Test Key"
     
-    # Verify API key was stored
-    mock_keys_table.put_item.assert_called_once()
+    # Verify API key was stored in one transaction guarded by the app's existence
+    mock_apps_table.get_item.assert_not_called()
+    transact_items = mock_client.transact_write_items.call_args.kwargs["TransactItems"]
+    assert transact_items[0]["ConditionCheck"]["Key"] == {"id": {"S": "test-app"}}
+    assert transact_items[1]["Put"]["Item"]["name"] == {"S": "Test Key"}
 
 @pytest.mark.regression
-@patch('admin.server.dynamodb')
-def test_api_key_format_consistency(mock_dynamodb, client):
+@patch('admin.server.api_keys_table')
+@patch('admin.server.applications_table')
+def test_api_key_format_consistency(mock_apps_table, mock_keys_table, client):
     """Regression test: Ensure API key format remains consistent."""
     # Mock application exists
-    mock_apps_table = MagicMock()
     mock_apps_table.get_item.return_value = {
         "Item": {"id": "test-app", "name": "Test App"}
     }
     
-    mock_keys_table = MagicMock()
-    
-    def table_side_effect(table_name):
-        if "applications" in table_name:
-            return mock_apps_table
-        return mock_keys_table
-    
-    mock_dynamodb.Table.side_effect = table_side_effect
-    
     response = client.post("/app/test-app/api-key")
     assert response.status_code == 201
     
@@ -141,4 +138,135 @@ def test_cors_headers(client):
     
     # Test that the endpoint works (CORS is configured at middleware level)
     data = response.json()
-    assert data["status"] == "healthy"
\ No newline at end of file
+    assert data["status"] == "healthy"
+
+@pytest.mark.unit
+@patch('admin.server.auth_dynamodb_client')
+def test_verify_api_key_cached(mock_table):
+    """Test that repeated key verification is served from the in-process cache."""
+    from admin import server
+
+    key_record = {"app_id": "test-app", "id": "key-1", "is_active": True, "expires_at": None}
+    mock_table.query.return_value = {"Items": [{
+        "app_id": {"S": "test-app"},
+        "id": {"S": "key-1"},
+        "is_active": {"BOOL": True},
+        "expires_at": {"NULL": True}
+    }]}
+
+    assert server.verify_api_key("sk_cached") == key_record
+    assert server.verify_api_key("sk_cached") == key_record
+    mock_table.query.assert_called_once()
+
+    # Revocation evicts the cached record
+    server.invalidate_cached_keys("test-app", "key-1")
+    server.verify_api_key("sk_cached")
+    assert mock_table.query.call_count == 2
+    server.invalidate_cached_keys("test-app")
+
+@pytest.mark.unit
+@patch('admin.server.applications_table')
+def test_get_application_response_cached(mock_table, client):
+    """Test that repeated reads are cached until a write clears them."""
+    mock_table.get_item.return_value = {
+        "Item": {
+            "id": "cached-app",
+            "name": "Cached App",
+            "application_id": "cached.app",
+            "email": "test@example.com",
+            "domain": "example.com",
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": "2024-01-01T00:00:00+00:00"
+        }
+    }
+
+    assert client.get("/app/cached-app").status_code == 200
+    assert client.get("/app/cached-app").json()["name"] == "Cached App"
+    assert mock_table.get_item.call_count == 1
+
+    # Key verification is not a write, so it keeps the cache
+    with patch('admin.server.verify_api_key', return_value={"app_id": "cached-app"}), \
+            patch('admin.server.update_last_used'):
+        assert client.post("/verify-key", headers={"X-API-Key": "sk_test"}).status_code == 200
+    client.get("/app/cached-app")
+    assert mock_table.get_item.call_count == 1
+
+    client.delete("/app/cached-app")
+    client.get("/app/cached-app")
+    # DELETE cleared the cache, so the next GET reads the table again
+    assert mock_table.get_item.call_count == 2
+
+@pytest.mark.unit
+@patch('admin.server.applications_table')
+def test_response_cache_behind_cors(mock_table, client):
+    """Test that cached responses never carry CORS headers from an earlier request."""
+    mock_table.scan.return_value = {"Items": []}
+    headers = {"Origin": "https://a.example", "Cookie": "session=1"}
+
+    for _ in range(3):
+        response = client.get("/apps", headers=headers)
+        assert response.headers["access-control-allow-origin"] == "https://a.example"
+        assert response.headers["vary"] == "Origin"
+    assert mock_table.scan.call_count == 1
+
+    response = client.get("/apps")
+    assert "access-control-allow-origin" not in response.headers
+    assert "vary" not in response.headers
+
+@pytest.mark.unit
+@patch('admin.server.applications_table')
+def test_update_application_single_write(mock_table, client, sample_application):
+    """Test that updates are one conditional UpdateItem, 404 when the app is missing."""
+    from botocore.exceptions import ClientError
+
+    mock_table.update_item.side_effect = ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}}, "UpdateItem"
+    )
+
+    response = client.put("/app/missing-app", json=sample_application)
+    assert response.status_code == 404
+    mock_table.get_item.assert_not_called()
+    assert mock_table.update_item.call_args.kwargs["ConditionExpression"] == "attribute_exists(id)"
+
+@pytest.mark.unit
+@patch('admin.server.auth_dynamodb_client')
+def test_verify_api_key_rejects_unprefixed(mock_table):
+    """Test that keys without the issued prefix are rejected without a lookup."""
+    from admin import server
+
+    assert server.verify_api_key("not-a-key") is None
+    mock_table.query.assert_not_called()
+
+@pytest.mark.unit
+def test_known_origin_cors_middleware():
+    """Test the prebuilt-header CORS middleware used for explicit origins."""
+    from fastapi import FastAPI
+    from admin.server import KnownOriginCORSMiddleware
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(
+        KnownOriginCORSMiddleware,
+        allow_origins=["https://frontend.example.com"],
+        allow_methods=["GET", "POST"],
+        allow_headers=["X-API-Key"],
+        expose_headers=["X-Total-Count"]
+    )
+    cors_client = TestClient(app)
+
+    response = cors_client.get("/ping", headers={"Origin": "https://frontend.example.com"})
+    assert response.headers["access-control-allow-origin"] == "https://frontend.example.com"
+    assert response.headers["access-control-expose-headers"] == "X-Total-Count"
+
+    response = cors_client.get("/ping", headers={"Origin": "https://evil.example.com"})
+    assert "access-control-allow-origin" not in response.headers
+
+    preflight = {"Access-Control-Request-Method": "POST", "Access-Control-Request-Headers": "x-api-key"}
+    response = cors_client.options("/ping", headers={"Origin": "https://frontend.example.com", **preflight})
+    assert response.status_code == 200
+    response = cors_client.options("/ping", headers={"Origin": "https://evil.example.com", **preflight})
+    assert response.status_code == 400
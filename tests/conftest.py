@@ -1,5 +1,6 @@
 """Test configuration and fixtures."""
 import os
+import sys
 import pytest
 import boto3
 from moto import mock_aws
@@ -18,9 +19,12 @@ os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
 
 fake = Faker()
 
-@pytest.fixture(scope="function", autouse=True)
+# Tables every test starts with; anything else a test creates is dropped after it
+SHARED_TABLES = ("test-applications", "test-api-keys")
+
+@pytest.fixture(scope="session", autouse=True)
 def aws_mocks():
-    """Mock all AWS services and create tables."""
+    """Mock all AWS services and create tables once for the whole session."""
     with mock_aws():
         # Create DynamoDB tables
         dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
@@ -47,7 +51,28 @@ def aws_mocks():
             BillingMode="PAY_PER_REQUEST"
         )
         
-        yield
+        yield dynamodb
+
+@pytest.fixture(autouse=True)
+def _reset_aws_state(aws_mocks):
+    """Give each test empty shared tables, no leftover queues or tables and no cached responses."""
+    yield
+    admin_server = sys.modules.get("admin.server")
+    if admin_server is not None:
+        admin_server.response_cache.clear()
+    dynamodb = aws_mocks
+    for table in dynamodb.tables.all():
+        if table.name not in SHARED_TABLES:
+            table.delete()
+            continue
+        key_names = [key["AttributeName"] for key in table.key_schema]
+        with table.batch_writer() as batch:
+            for item in table.scan(ProjectionExpression=", ".join(key_names))["Items"]:
+                batch.delete_item(Key=item)
+    
+    sqs = boto3.client("sqs", region_name="us-east-1")
+    for queue_url in sqs.list_queues().get("QueueUrls", []):
+        sqs.delete_queue(QueueUrl=queue_url)
 
 @pytest.fixture
 def client():
@@ -2,11 +2,6 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
-import sys
-import os
-
-# Add requestor directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../requestor'))
 
 # Using shared requestor_client fixture from conftest.py
 
@@ -116,4 +111,104 @@ def test_cors_headers(client):
     with patch('requestor.app.main.app_state') as mock_state:
         mock_state.ready = True
         response = client.get("/health")
-        assert response.status_code == 200
\ No newline at end of file
+        assert response.status_code == 200
+
+@pytest.mark.unit
+def test_send_messages_to_queue_batches():
+    """Test that batch sends split into SendMessageBatch calls of 10 and keep order."""
+    import boto3
+    from requestor.app import sqs_client
+
+    boto3.client("sqs", region_name="us-east-1").create_queue(QueueName="test-queue")
+
+    with patch.object(sqs_client.get_sqs_client(), "send_message_batch",
+                      wraps=sqs_client.get_sqs_client().send_message_batch) as mock_batch:
+        results = sqs_client.send_messages_to_queue([{"index": i} for i in range(12)])
+
+    assert [len(call.kwargs["Entries"]) for call in mock_batch.call_args_list] == [10, 2]
+    assert len(results) == 12
+    assert all("MessageId" in result for result in results)
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@patch('requestor.app.sqs_client.send_messages_to_queue')
+@patch('requestor.app.sqs_client.send_message_to_queue')
+async def test_message_batcher_coalesces_window(mock_send, mock_send_batch):
+    """Test that messages submitted within the window go out in one batch call."""
+    import asyncio
+    from requestor.app.sqs_client import MessageBatcher
+
+    mock_send_batch.side_effect = lambda messages: [{"MessageId": str(m["index"])} for m in messages]
+    batcher = MessageBatcher(window=0.05)
+    batcher.start()
+    try:
+        results = await asyncio.gather(*(batcher.submit({"index": i}) for i in range(3)))
+    finally:
+        await batcher.stop()
+
+    assert results == [{"MessageId": "0"}, {"MessageId": "1"}, {"MessageId": "2"}]
+    mock_send_batch.assert_called_once_with([{"index": 0}, {"index": 1}, {"index": 2}])
+    mock_send.assert_not_called()
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@patch('requestor.app.sqs_client.send_messages_to_queue')
+@patch('requestor.app.sqs_client.send_message_to_queue')
+async def test_message_batcher_single_message(mock_send, mock_send_batch):
+    """Test that a message alone in its window is sent with plain SendMessage."""
+    from requestor.app.sqs_client import MessageBatcher
+
+    mock_send.return_value = {"MessageId": "only"}
+    batcher = MessageBatcher(window=0.01)
+    batcher.start()
+    try:
+        assert await batcher.submit({"index": 0}) == {"MessageId": "only"}
+    finally:
+        await batcher.stop()
+
+    mock_send.assert_called_once_with({"index": 0})
+    mock_send_batch.assert_not_called()
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@patch('requestor.app.sqs_client.send_messages_to_queue')
+async def test_message_batcher_per_caller_failure(mock_send_batch):
+    """Test that a failed batch entry fails only its own caller."""
+    import asyncio
+    from requestor.app.sqs_client import MessageBatcher
+
+    mock_send_batch.return_value = [
+        {"Id": "0", "MessageId": "ok"},
+        {"Id": "1", "Code": "InternalError", "Message": "boom"}
+    ]
+    batcher = MessageBatcher(window=0.05)
+    batcher.start()
+    try:
+        results = await asyncio.gather(
+            batcher.submit({"index": 0}), batcher.submit({"index": 1}), return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+    assert results[0]["MessageId"] == "ok"
+    assert isinstance(results[1], RuntimeError)
+    assert "InternalError" in str(results[1])
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@patch('requestor.app.sqs_client.send_messages_to_queue')
+async def test_message_batcher_stop_drains(mock_send_batch):
+    """Test that stop() sends messages the collector already picked up."""
+    import asyncio
+    from requestor.app.sqs_client import MessageBatcher
+
+    mock_send_batch.side_effect = lambda messages: [{"MessageId": str(m["index"])} for m in messages]
+    batcher = MessageBatcher(window=10)
+    batcher.start()
+    pending = [asyncio.create_task(batcher.submit({"index": i})) for i in range(2)]
+    # Give the collector time to take both messages into its open batch
+    await asyncio.sleep(0.05)
+    await batcher.stop()
+
+    results = await asyncio.wait_for(asyncio.gather(*pending), timeout=1)
+    assert results == [{"MessageId": "0"}, {"MessageId": "1"}]
@@ -2,11 +2,6 @@
 import pytest
 import json
 from unittest.mock import patch, MagicMock
-import sys
-import os
-
-# Add worker directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../worker'))
 
 @pytest.mark.unit
 @patch('worker.app.main.dynamodb_client')
@@ -37,7 +32,7 @@ def test_process_email_message(mock_notifier, mock_db_client):
     mock_notifier.send_email.assert_called_once()
     mock_db_client.log_request.assert_called_with(
         "test-app", 
-        json.loads(message["Body"]), 
+        message["Body"], 
         "delivered"
     )
 
@@ -69,7 +64,7 @@ def test_process_sms_message(mock_notifier, mock_db_client):
     mock_notifier.send_sns.assert_called_once()
     mock_db_client.log_request.assert_called_with(
         "test-app",
-        json.loads(message["Body"]),
+        message["Body"],
         "delivered"
     )
 
@@ -105,6 +100,46 @@ def test_email_fallback_behavior(mock_notifier, mock_db_client):
     mock_notifier.send_email.assert_called_once()
     
     # Verify fallback email was used
-    call_args = mock_notifier.send_email.call_args[0]
-    email_addresses = call_args[1]
-    assert "fallback@example.com" in email_addresses
\ No newline at end of file
+    kwargs = mock_notifier.send_email.call_args.kwargs
+    assert "fallback@example.com" in kwargs["to_addresses"]
+
+@pytest.mark.unit
+@patch('worker.app.sqs_client.sqs')
+def test_delete_messages_batches_and_retries(mock_sqs):
+    """Test that deletes go out 10 per batch and failed entries are retried once."""
+    from worker.app.sqs_client import delete_messages
+
+    mock_sqs.delete_message_batch.side_effect = [
+        {"Successful": [{"Id": str(i)} for i in range(10) if i != 3], "Failed": [{"Id": "3"}]},
+        {"Successful": [{"Id": "0"}]},
+        {"Failed": [{"Id": "0"}, {"Id": "1"}]},
+        {"Failed": [{"Id": "1"}]},
+    ]
+
+    failed = delete_messages([f"handle-{i}" for i in range(12)])
+
+    calls = [call.kwargs["Entries"] for call in mock_sqs.delete_message_batch.call_args_list]
+    assert [len(entries) for entries in calls] == [10, 1, 2, 2]
+    assert calls[1] == [{"Id": "0", "ReceiptHandle": "handle-3"}]
+    assert failed == ["handle-11"]
+
+@pytest.mark.unit
+@patch('worker.app.dynamodb_client.applications_table')
+def test_application_config_cached(mock_table):
+    """Test that found app configs are cached and missing apps are not."""
+    from worker.app import dynamodb_client
+
+    dynamodb_client.clear_application_config_cache()
+    mock_table.get_item.return_value = {"Item": {"Application": "test-app"}}
+    assert dynamodb_client.get_application_config("test-app") == {"Application": "test-app"}
+    assert dynamodb_client.get_application_config("test-app") == {"Application": "test-app"}
+    assert mock_table.get_item.call_count == 1
+
+    mock_table.get_item.return_value = {}
+    assert dynamodb_client.get_application_config("new-app") is None
+    assert dynamodb_client.get_application_config("new-app") is None
+    assert mock_table.get_item.call_count == 3
+
+    dynamodb_client.clear_application_config_cache()
+    dynamodb_client.get_application_config("test-app")
+    assert mock_table.get_item.call_count == 4
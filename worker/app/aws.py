@@ -0,0 +1,19 @@
+"""Shared AWS clients for worker service."""
+import boto3
+from botocore.config import Config
+from . import config
+
+# Pooled keep-alive connections and adaptive retries for every client/resource.
+# Each pool thread holds at most one connection per service, so the pool
+# grows with WORKER_CONCURRENCY to leave room for the poller and flushers.
+SHARED_CONFIG = Config(
+    max_pool_connections=max(64, config.WORKER_CONCURRENCY * 2),
+    retries={"mode": config.AWS_RETRY_MODE, "max_attempts": config.AWS_MAX_ATTEMPTS},
+    tcp_keepalive=True
+)
+
+# One client per service for the whole process; boto3 clients are thread-safe
+sqs = boto3.client("sqs", region_name=config.AWS_REGION, config=SHARED_CONFIG)
+ses = boto3.client("ses", region_name=config.AWS_REGION, config=SHARED_CONFIG)
+sns = boto3.client("sns", region_name=config.AWS_REGION, config=SHARED_CONFIG)
+dynamodb = boto3.resource("dynamodb", region_name=config.AWS_REGION, config=SHARED_CONFIG)
@@ -5,11 +5,24 @@ load_dotenv()
 
 # AWS Configuration
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+# Retry policy for every AWS client (same variables botocore reads itself)
+AWS_MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", "5"))
+AWS_RETRY_MODE = os.getenv("AWS_RETRY_MODE", "adaptive")
 
 # SQS Configuration - Production queue URLs (Standard Queues)
 SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL", "https://sqs.us-east-1.amazonaws.com/588082972397/yantech-notification-queue-dev")
 SQS_DLQ_URL = os.getenv("SQS_DLQ_URL", "https://sqs.us-east-1.amazonaws.com/588082972397/yantech-notification-dlq-dev")
 
+# Messages processed concurrently; polling continues while slots are free
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "16"))
+
+# Delivery targets used when an application's config doesn't set its own
+DEFAULT_SES_DOMAIN_ARN = os.getenv("DEFAULT_SES_DOMAIN_ARN", "arn:aws:ses:us-east-1:588082972397:identity/project-dolphin.com")
+DEFAULT_SNS_TOPIC_ARN = os.getenv("DEFAULT_SNS_TOPIC_ARN", "arn:aws:sns:us-east-1:588082972397:YANTECH-push-notifications-dev")
+
+# Seconds an application's config is reused before it is read again (0 disables)
+APP_CONFIG_CACHE_TTL = float(os.getenv("APP_CONFIG_CACHE_TTL_SECONDS", "300"))
+
 # DynamoDB Tables - Match Terraform naming
 APPLICATIONS_TABLE = os.getenv("APPLICATIONS_TABLE", "YANTECH-YNP01-AWS-DYNAMODB-APPLICATIONS-DEV")
 REQUEST_LOG_TABLE = os.getenv("REQUEST_LOG_TABLE", "YANTECH-YNP01-AWS-DYNAMODB-REQUESTS-DEV")
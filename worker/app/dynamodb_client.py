@@ -1,44 +1,128 @@
 """DynamoDB client operations for worker service."""
-import boto3
 from datetime import datetime, timezone
+import orjson
+import threading
+import time
 import uuid
-from typing import Dict, Any, Optional
-from . import config
+from typing import Dict, Any, List, Optional, Tuple
+from . import config, logger
+from .aws import dynamodb
 
-dynamodb = boto3.resource(
-    "dynamodb",
-    region_name=config.AWS_REGION
-)
+# Table handles shared by every message
+applications_table = dynamodb.Table(config.APPLICATIONS_TABLE)
+request_log_table = dynamodb.Table(config.REQUEST_LOG_TABLE)
+
+def serialize_payload(payload: Any) -> str:
+    """Encode a logged request as JSON; strings are stored unchanged."""
+    if not payload:
+        return ""
+    if isinstance(payload, str):
+        return payload
+    return orjson.dumps(payload, default=str).decode()
+
+# Request logs are written in BatchWriteItem calls of up to 25 items, at
+# least every LOG_FLUSH_INTERVAL seconds
+LOG_FLUSH_SIZE = 25
+LOG_FLUSH_INTERVAL = 0.2
+
+class RequestLogBuffer:
+    """Collect request log items and write them to a table in batches.
+
+    A daemon thread flushes every LOG_FLUSH_INTERVAL seconds, or as soon as
+    LOG_FLUSH_SIZE items are pending. Call flush() on shutdown to write the
+    rest. Write failures are logged, not raised to the caller of add().
+    """
+    def __init__(self, table: Any) -> None:
+        self.table = table
+        self.items: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """Queue an item for the next batch write."""
+        with self.lock:
+            self.items.append(item)
+            full = len(self.items) >= LOG_FLUSH_SIZE
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="request-log-flusher", daemon=True)
+                self.thread.start()
+        if full:
+            self.wakeup.set()
+
+    def flush(self) -> None:
+        """Write all pending items now."""
+        with self.lock:
+            items, self.items = self.items, []
+        if not items:
+            return
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+
+    def _run(self) -> None:
+        while True:
+            self.wakeup.wait(LOG_FLUSH_INTERVAL)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.log("Failed to write request logs: %s", e)
+
+_log_buffer = RequestLogBuffer(request_log_table)
+
+# Application configs found in DynamoDB, reused for APP_CONFIG_CACHE_TTL
+# seconds. Missing applications are not cached, so a new one works at once.
+APP_CONFIG_CACHE_MAXSIZE = 256
+_config_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+_config_cache_lock = threading.Lock()
 
 def get_application_config(app_id: str) -> Optional[Dict[str, Any]]:
-    """Get application configuration from DynamoDB."""
+    """Get application configuration, from the cache or DynamoDB."""
     if not app_id or not isinstance(app_id, str):
         raise ValueError("app_id must be a non-empty string")
+
+    with _config_cache_lock:
+        entry = _config_cache.get(app_id)
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
     
     try:
-        table = dynamodb.Table(config.APPLICATIONS_TABLE)
-        response = table.get_item(Key={"Application": str(app_id)})
-        return response.get("Item")
+        response = applications_table.get_item(Key={"Application": str(app_id)})
     except Exception as e:
         raise RuntimeError(f"Failed to get application config: {str(e)}")
 
+    item = response.get("Item")
+    if item is not None and config.APP_CONFIG_CACHE_TTL > 0:
+        with _config_cache_lock:
+            _config_cache.pop(app_id, None)
+            while len(_config_cache) >= APP_CONFIG_CACHE_MAXSIZE:
+                del _config_cache[next(iter(_config_cache))]
+            _config_cache[app_id] = (item, time.monotonic() + config.APP_CONFIG_CACHE_TTL)
+    return item
+
+def clear_application_config_cache() -> None:
+    """Forget cached application configs so the next lookups read DynamoDB."""
+    with _config_cache_lock:
+        _config_cache.clear()
+
 def log_request(application_id: str, request_data: Any, status: str, error: Optional[str] = None) -> None:
-    """Log request details to DynamoDB."""
+    """Queue request details for a batched write to DynamoDB."""
     if not application_id or not isinstance(application_id, str):
         raise ValueError("application_id must be a non-empty string")
     if not status or not isinstance(status, str):
         raise ValueError("status must be a non-empty string")
     
-    try:
-        table = dynamodb.Table(config.REQUEST_LOG_TABLE)
-        table.put_item(Item={
-            "RecordID": str(uuid.uuid4()),
-            "Application": str(application_id),
-            "Timestamp": datetime.now(timezone.utc).isoformat(),
-            "Status": str(status),
-            "Error": str(error) if error else "None",
-            "Request": str(request_data) if request_data else "",
-        })
-    except Exception as e:
-        raise RuntimeError(f"Failed to log request: {str(e)}")
+    _log_buffer.add({
+        "RecordID": uuid.uuid4().hex,
+        "Application": str(application_id),
+        "Timestamp": datetime.now(timezone.utc).isoformat(),
+        "Status": str(status),
+        "Error": str(error) if error else "None",
+        "Request": serialize_payload(request_data),
+    })
+
+def flush_request_logs() -> None:
+    """Write any buffered request logs; call before the worker exits."""
+    _log_buffer.flush()
 
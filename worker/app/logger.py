@@ -1,19 +1,34 @@
 """Simple logging utility for worker service."""
 import sys
 import logging
+import orjson
+from datetime import datetime, timezone
 from typing import Any
+from . import config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single-line JSON object for log aggregation."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+# Configure logging: one JSON line per record on stdout
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(JsonFormatter())
+logging.basicConfig(level=config.LOG_LEVEL, handlers=[_handler])
 logger = logging.getLogger(__name__)
 
-def log(msg: Any) -> None:
-    """Log message to stdout and logger."""
-    message = f"[✓] {msg}"
-    sys.stdout.write(f"{message}\n")
-    sys.stdout.flush()
-    logger.info(msg)
+def log(msg: Any, *args: Any) -> None:
+    """Log an INFO message; %-style args are only formatted if INFO is enabled."""
+    logger.info(msg, *args)
 
+def debug(msg: Any, *args: Any) -> None:
+    """Log per-message detail, formatted only when LOG_LEVEL is DEBUG."""
+    logger.debug(msg, *args)
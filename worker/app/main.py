@@ -1,89 +1,141 @@
 """Main worker process for handling SQS messages."""
-import json
+import random
+import signal
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from orjson import loads
 from typing import Dict, Any, List
-from . import sqs_client, dynamodb_client, notifier, logger
+from . import config, sqs_client, dynamodb_client, notifier, logger
 from .health import health_checker
 
 
+def _send_email(body: Dict[str, Any], cfg: Dict[str, Any]) -> None:
+    """Deliver an EMAIL notification through SES."""
+    # Use Recipient field if EmailAddresses is not available or null
+    email_addresses = body.get("EmailAddresses")
+    if not email_addresses or email_addresses == [None] or email_addresses == [""]:
+        email_addresses = [body.get("Recipient")]
+    if isinstance(email_addresses, str):
+        email_addresses = [email_addresses]
+    # Filter out None/empty values
+    email_addresses = [email for email in email_addresses if email]
+
+    notifier.send_email(
+        domain_arn=cfg.get("SES-Domain-ARN", config.DEFAULT_SES_DOMAIN_ARN),
+        to_addresses=email_addresses,
+        subject=body["Subject"],
+        body=body["Message"]
+    )
+    logger.debug("Email sent to %s", email_addresses)
+
+
+def _send_sns(body: Dict[str, Any], cfg: Dict[str, Any]) -> None:
+    """Deliver an SMS or PUSH notification through SNS."""
+    notifier.send_sns(topic_arn=cfg.get("SNS-Topic-ARN", config.DEFAULT_SNS_TOPIC_ARN), message=body["Message"])
+    logger.debug("Notification sent via %s to %s", body["OutputType"].upper(), body.get("PhoneNumber") or body.get("PushToken"))
+
+
+# Delivery handler for each OutputType
+DISPATCH = {"EMAIL": _send_email, "SMS": _send_sns, "PUSH": _send_sns}
+
+
 def _process_message(msg: Dict[str, Any]) -> bool:
     """Process a single SQS message. Returns True if successful, False otherwise."""
     body = None
     try:
-        body = json.loads(msg["Body"])
+        body = loads(msg["Body"])
         app_id = body["Application"]
-        logger.log(f"Processing message for application: {app_id}")
+        logger.debug("Processing message for application: %s", app_id)
         cfg = dynamodb_client.get_application_config(app_id)
         if not cfg:
             raise ValueError("App config not found")
 
         output = body.get("OutputType", "").upper()  # Convert to uppercase
-        if output == "EMAIL":
-            # Use Recipient field if EmailAddresses is not available or null
-            email_addresses = body.get("EmailAddresses")
-            if not email_addresses or email_addresses == [None] or email_addresses == [""]:
-                email_addresses = [body.get("Recipient")]
-            if isinstance(email_addresses, str):
-                email_addresses = [email_addresses]
-            # Filter out None/empty values
-            email_addresses = [email for email in email_addresses if email]
-            
-            # Use default SES domain ARN if not configured
-            ses_domain = cfg.get("SES-Domain-ARN", "arn:aws:ses:us-east-1:588082972397:identity/project-dolphin.com")
-            notifier.send_email(ses_domain, email_addresses, body["Subject"], body["Message"])
-            logger.log(f"Email sent to {email_addresses}")
-        elif output in ["SMS", "PUSH"]:
-            # Use default SNS topic ARN if not configured
-            sns_topic = cfg.get("SNS-Topic-ARN", "arn:aws:sns:us-east-1:588082972397:YANTECH-push-notifications-dev")
-            notifier.send_sns(sns_topic, body["Message"])
-            logger.log(f"Notification sent via {output} to {body.get('PhoneNumber') or body.get('PushToken')}")
-        else:
+        send = DISPATCH.get(output)
+        if send is None:
             raise ValueError(f"Unsupported OutputType: {output}")
+        send(body, cfg)
 
-        dynamodb_client.log_request(app_id, body, "delivered")
-        logger.log(f"Message processed successfully: {body}")
+        # Log the body as received; it is already JSON, so it isn't re-encoded
+        dynamodb_client.log_request(app_id, msg["Body"], "delivered")
+        logger.debug("Message processed successfully for application: %s", app_id)
         health_checker.record_message_processed()
         return True
     except Exception as e:
         # Log the error
-        dynamodb_client.log_request(body.get("Application", "unknown") if body else "unknown", body, "failed", str(e))
-        logger.log(f"Error processing message: {e}")
+        dynamodb_client.log_request(body.get("Application", "unknown") if body else "unknown", msg.get("Body"), "failed", str(e))
+        logger.log("Error processing message: %s", e)
         health_checker.record_error()
         # Don't delete the message - let it retry or go to DLQ
-        logger.log(f"Message will be retried or sent to DLQ after max attempts")
+        logger.log("Message will be retried or sent to DLQ after max attempts")
         return False
 
 
+def _handle_message(msg: Dict[str, Any], slots: threading.BoundedSemaphore) -> None:
+    """Process a message on a pool thread, queueing its delete once delivered."""
+    try:
+        if _process_message(msg):
+            # Only delete message if processing was successful
+            sqs_client.queue_delete(msg["ReceiptHandle"])
+    finally:
+        slots.release()
+
+
 def run_worker() -> None:
-    """Main worker loop for processing SQS messages."""
+    """Main worker loop for processing SQS messages.
+
+    Up to WORKER_CONCURRENCY messages are processed at once on a thread pool,
+    and the next poll starts as soon as a slot is free rather than after the
+    whole previous batch.
+    """
     logger.log("Worker started polling SQS...")
     backoff_delay = 1  # Initial backoff delay in seconds
     max_backoff = 60   # Maximum backoff delay in seconds
+    slots = threading.BoundedSemaphore(config.WORKER_CONCURRENCY)
     
-    while True:
-        try:
-            messages = sqs_client.poll_messages()
-            # Reset backoff delay after successful API call
-            backoff_delay = 1
-        except Exception as e:
-            logger.log(f"Error polling SQS: {e}")
-            logger.log(f"Backing off for {backoff_delay} seconds")
-            health_checker.record_error()
-            time.sleep(backoff_delay)
-            # Double the backoff delay for next attempt, up to maximum
-            backoff_delay = min(backoff_delay * 2, max_backoff)
-            continue
-        
-        if not messages:
-            time.sleep(1)  # Short sleep when no messages
-            continue
-            
-        for msg in messages:
-            if _process_message(msg):
-                # Only delete message if processing was successful
-                sqs_client.delete_message(msg["ReceiptHandle"])
-                logger.log("Message deleted from SQS")
+    with ThreadPoolExecutor(max_workers=config.WORKER_CONCURRENCY) as executor:
+        while True:
+            # Wait for one free slot, then claim up to 10 (the SQS maximum)
+            slots.acquire()
+            free = 1
+            while free < 10 and slots.acquire(blocking=False):
+                free += 1
+
+            try:
+                messages = sqs_client.poll_messages(max_messages=free)
+                # Reset backoff delay after successful API call
+                backoff_delay = 1
+            except Exception as e:
+                for _ in range(free):
+                    slots.release()
+                logger.log("Error polling SQS: %s", e)
+                # Jitter spreads retries so replicas don't poll again in lockstep
+                delay = backoff_delay * (0.5 + random.random())
+                logger.log("Backing off for %.1f seconds", delay)
+                health_checker.record_error()
+                time.sleep(delay)
+                # Double the backoff delay for next attempt, up to maximum
+                backoff_delay = min(backoff_delay * 2, max_backoff)
+                continue
+
+            for _ in range(free - len(messages)):
+                slots.release()
+            if messages:
+                logger.log("Received %d messages", len(messages))
+            for msg in messages:
+                executor.submit(_handle_message, msg, slots)
 
 if __name__ == "__main__":
-    run_worker()
+    # Exit through SystemExit on SIGTERM so buffered request logs get written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # SIGHUP reloads application configs from DynamoDB (not available on Windows)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: dynamodb_client.clear_application_config_cache())
+    try:
+        run_worker()
+    finally:
+        sqs_client.flush_deletes()
+        dynamodb_client.flush_request_logs()
 
@@ -1,25 +1,100 @@
-import boto3
 import json
+import threading
+from typing import List, Optional
 from . import config , logger
+from .aws import sqs
 
-sqs = boto3.client(
-    "sqs",
-    region_name=config.AWS_REGION
-)
+# DeleteMessageBatch accepts at most 10 entries per call
+DELETE_BATCH_LIMIT = 10
+DELETE_FLUSH_INTERVAL = 0.2
 
-def poll_messages(max_messages=1):
-    logger.log(f"Polling messages from QueueUrl: {config.SQS_QUEUE_URL}")
+def poll_messages(max_messages=10):
+    # Long poll: wait up to the 20s maximum for messages instead of re-polling
+    logger.debug("Polling messages from QueueUrl: %s", config.SQS_QUEUE_URL)
     response = sqs.receive_message(
         QueueUrl=config.SQS_QUEUE_URL,
         MaxNumberOfMessages=max_messages,
-        WaitTimeSeconds=10
+        WaitTimeSeconds=20
     )
     return response.get("Messages", [])
 
 def delete_message(receipt_handle):
-    logger.log(f"Deleting message with ReceiptHandle: {receipt_handle}")
+    logger.debug("Deleting message with ReceiptHandle: %s", receipt_handle)
     sqs.delete_message(
         QueueUrl=config.SQS_QUEUE_URL,
         ReceiptHandle=receipt_handle
     )
 
+def delete_messages(receipt_handles: List[str]) -> List[str]:
+    """Delete messages with DeleteMessageBatch, 10 per call.
+
+    Failed entries are retried once; the receipt handles that still failed
+    are returned and those messages reappear after their visibility timeout.
+    """
+    failed: List[str] = []
+    for start in range(0, len(receipt_handles), DELETE_BATCH_LIMIT):
+        pending = receipt_handles[start:start + DELETE_BATCH_LIMIT]
+        for _ in range(2):
+            response = sqs.delete_message_batch(
+                QueueUrl=config.SQS_QUEUE_URL,
+                Entries=[{"Id": str(i), "ReceiptHandle": handle} for i, handle in enumerate(pending)]
+            )
+            pending = [pending[int(entry["Id"])] for entry in response.get("Failed", [])]
+            if not pending:
+                break
+        failed.extend(pending)
+    return failed
+
+class DeleteBuffer:
+    """Collect receipt handles of processed messages and delete them in batches.
+
+    A daemon thread deletes every DELETE_FLUSH_INTERVAL seconds, or as soon
+    as DELETE_BATCH_LIMIT handles are pending. Call flush() on shutdown to
+    delete the rest.
+    """
+    def __init__(self) -> None:
+        self.handles: List[str] = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def add(self, receipt_handle: str) -> None:
+        """Queue a message for the next batch delete."""
+        with self.lock:
+            self.handles.append(receipt_handle)
+            full = len(self.handles) >= DELETE_BATCH_LIMIT
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="sqs-delete-flusher", daemon=True)
+                self.thread.start()
+        if full:
+            self.wakeup.set()
+
+    def flush(self) -> None:
+        """Delete all pending messages now."""
+        with self.lock:
+            handles, self.handles = self.handles, []
+        if not handles:
+            return
+        failed = delete_messages(handles)
+        logger.log("Deleted %d messages from SQS", len(handles) - len(failed))
+        if failed:
+            logger.log("Failed to delete %d messages; they will be redelivered", len(failed))
+
+    def _run(self) -> None:
+        while True:
+            self.wakeup.wait(DELETE_FLUSH_INTERVAL)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.log("Error deleting messages from SQS: %s", e)
+
+_delete_buffer = DeleteBuffer()
+
+def queue_delete(receipt_handle: str) -> None:
+    """Delete a processed message in the next batch."""
+    _delete_buffer.add(receipt_handle)
+
+def flush_deletes() -> None:
+    """Delete any buffered messages; call before the worker exits."""
+    _delete_buffer.flush()